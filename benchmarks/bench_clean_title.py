@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for title normalisation over a corpus of real YouTube/Spotify titles.
+Also checks that every corpus entry still cleans to its recorded output
+(title, artist, cache key and search query); exits 1 on any mismatch.
+
+    uv run python benchmarks/bench_clean_title.py [-n 200]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import universal_lyrics  # noqa: E402
+
+CORPUS_PATH = Path(__file__).resolve().parent / "title_corpus.json"
+
+
+def check(corpus: list[dict]) -> int:
+    """Return the number of entries whose output differs from the recorded one."""
+    failures = 0
+    for entry in corpus:
+        title, artist, cache_key = universal_lyrics.resolve_track(
+            entry["title"], entry["artist"], entry["player"]
+        )
+        actual = {
+            "title": title,
+            "artist": artist,
+            "cache_key": cache_key,
+            "query": universal_lyrics.build_search_query(title, artist),
+        }
+        if actual != entry["expected"]:
+            failures += 1
+            print(f"MISMATCH {entry['title']!r}: {actual} != {entry['expected']}", file=sys.stderr)
+    return failures
+
+
+def bench(func, corpus: list[dict], iterations: int) -> float:
+    """Microseconds per call of func(title, artist, player) over the corpus."""
+    calls = [(e["title"], e["artist"], e["player"]) for e in corpus]
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for args in calls:
+            func(*args)
+    return (time.perf_counter() - start) / (iterations * len(calls)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = json.loads(CORPUS_PATH.read_text())
+    failures = check(corpus)
+
+    raw = universal_lyrics._clean_title.__wrapped__
+
+    def uncached(title, artist, player):
+        return raw(title, artist, "spotify" in player.lower())
+
+    universal_lyrics._clean_title.cache_clear()
+    print(f"corpus: {len(corpus)} titles, {len(corpus) - failures} match recorded output")
+    print(f"clean_title uncached: {bench(uncached, corpus, args.iterations):6.2f} us/call")
+    print(f"clean_title memoized: {bench(universal_lyrics.clean_title, corpus, args.iterations):6.2f} us/call")
+    print(
+        f"build_search_query:   "
+        f"{bench(lambda t, a, p: universal_lyrics.build_search_query(t, a), corpus, args.iterations):6.2f} us/call"
+    )
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
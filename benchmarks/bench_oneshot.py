@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Compare one-shot player detection: direct DBus vs. playerctl subprocesses.
+Run against a live session with a player open:
+
+    uv run python benchmarks/bench_oneshot.py [--target brave] [-n 20]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import universal_lyrics  # noqa: E402
+
+
+def bench(func, target, iterations: int) -> list[float]:
+    """Return per-call wall times in milliseconds."""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func(target)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--target", help="Target player name")
+    parser.add_argument("-n", "--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    paths = {"playerctl": universal_lyrics.find_player_state_playerctl}
+    if universal_lyrics.load_dbus():
+        paths["dbus"] = universal_lyrics.find_player_state_dbus
+    else:
+        print("dbus-python not installed; only benchmarking playerctl", file=sys.stderr)
+
+    for name, func in paths.items():
+        player, state = func(args.target)
+        timings = bench(func, args.target, args.iterations)
+        print(
+            f"{name:>10}: median {statistics.median(timings):7.2f} ms,"
+            f" min {min(timings):7.2f} ms, max {max(timings):7.2f} ms"
+            f"  (player: {player}, title: {state['title'] if state else None!r})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Startup budget check for one-shot invocations, based on `python -X importtime`.
+Fails (exit 1) if importing universal_lyrics exceeds the budget or pulls in
+modules that should only load for network fetches or daemon mode.
+
+    uv run python benchmarks/bench_startup.py [--budget-ms 100] [-n 5]
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Must stay lazy: only network fetches, the daemon or the playerctl fallback need them
+DEFERRED_MODULES = (
+    "syncedlyrics",
+    "requests",
+    "bs4",
+    "pympris",
+    "gi",
+    "dbus",
+    "concurrent.futures",
+    "subprocess",
+    "sqlite3",
+)
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)$")
+
+
+def import_profile() -> tuple[float, set[str]]:
+    """Return (cumulative import time of universal_lyrics in ms, imported module names)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import universal_lyrics"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        modules.add(match.group(4))
+        if match.group(4) == "universal_lyrics":
+            total_us = int(match.group(2))
+    return total_us / 1000, modules
+
+
+def oneshot_wall_time() -> float:
+    """Wall time (ms) of a full one-shot run, including interpreter startup."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(ROOT / "universal_lyrics.py"), "--format", "waybar"],
+        capture_output=True,
+        check=False,
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=100.0)
+    parser.add_argument("-n", "--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    timings = []
+    modules: set[str] = set()
+    for _ in range(args.iterations):
+        elapsed, modules = import_profile()
+        timings.append(elapsed)
+    best = min(timings)
+
+    eager = sorted(
+        name
+        for name in modules
+        if any(name == m or name.startswith(m + ".") for m in DEFERRED_MODULES)
+    )
+    wall = min(oneshot_wall_time() for _ in range(args.iterations))
+
+    print(f"import universal_lyrics: {best:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"one-shot --format waybar: {wall:.1f} ms wall (incl. interpreter start)")
+
+    failed = False
+    if best > args.budget_ms:
+        print("FAIL: import time over budget", file=sys.stderr)
+        failed = True
+    if eager:
+        print(f"FAIL: imported eagerly: {', '.join(eager)}", file=sys.stderr)
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the render hot path and the fetch/cache paths.
+Runs offline: players, playerctl and syncedlyrics are replaced by local fakes.
+Results are written as JSON; pass --compare to check them against an earlier run.
+
+    uv run python benchmarks/run_benchmarks.py [-k waybar] [--repeat 5]
+    uv run python benchmarks/run_benchmarks.py --compare benchmarks/results/<commit>.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import types
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import universal_lyrics  # noqa: E402
+
+CORPUS_PATH = Path(__file__).resolve().parent / "title_corpus.json"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+SHORT_LINES = 60  # a typical song
+LONG_LINES = 5000  # medleys, concert recordings, word-by-word LRC
+
+
+def make_lrc(lines: int, step: float = 3.5) -> str:
+    """Synthetic synced LRC with `lines` lines, `step` seconds apart."""
+    out = ["[ti:Benchmark]", "[ar:Benchmark Artist]"]
+    for i in range(lines):
+        t = i * step
+        out.append(f"[{int(t) // 60:02d}:{t % 60:05.2f}]line {i} 歌詞の行 {i}")
+    return "\n".join(out) + "\n"
+
+
+def positions(lines: int, step: float = 3.5, count: int = 64) -> list[float]:
+    """Playback positions spread over the whole song, off the line boundaries."""
+    return [(i * lines // count) * step + step / 2 for i in range(count)]
+
+
+class FakeProperties:
+    """org.freedesktop.DBus.Properties stand-in for one playing player."""
+
+    def __init__(self, title: str, artist: str, length: float):
+        self.start = time.time()
+        self.props = {
+            "PlaybackStatus": "Playing",
+            "Rate": 1.0,
+            "Metadata": {
+                "mpris:trackid": "/org/bench/track/1",
+                "mpris:length": int(length * 1_000_000),
+                "xesam:title": title,
+                "xesam:artist": [artist],
+            },
+        }
+
+    def GetAll(self, interface):
+        # Position advances in real time, like a playing track
+        self.props["Position"] = int((time.time() - self.start + 30.0) * 1_000_000)
+        return self.props
+
+
+FAKE_PLAYERCTL = """#!/bin/sh
+case "$*" in
+  "-l") echo spotify ;;
+  *" status") echo Playing ;;
+  *" position") echo 42.5 ;;
+  *"xesam:artist") echo "Benchmark Artist" ;;
+  *"xesam:title") echo "Benchmark Song (Official Video)" ;;
+esac
+"""
+
+
+def fake_syncedlyrics(lrc: str) -> types.ModuleType:
+    """Module standing in for syncedlyrics: Lrclib answers at once, others find nothing."""
+    module = types.ModuleType("syncedlyrics")
+
+    class Provider:
+        answer = None
+
+        def __init__(self):
+            self.session = types.SimpleNamespace(request=None)
+
+        def get_lrc(self, search_term):
+            return self.answer
+
+    module.providers = types.SimpleNamespace(
+        **{
+            name: type(name, (Provider,), {"answer": lrc if name == "Lrclib" else None})
+            for name in ("Lrclib", "Musixmatch", "NetEase", "Genius")
+        }
+    )
+    return module
+
+
+class Suite:
+    """Registry of named cases; each case is (setup) -> zero-argument callable."""
+
+    def __init__(self, workdir: Path):
+        self.workdir = workdir
+        self.cases: dict[str, Callable[[], Callable[[], object]]] = {}
+        self.cleanups: list = []
+        self.short_lrc = make_lrc(SHORT_LINES)
+        self.long_lrc = make_lrc(LONG_LINES)
+
+    def case(self, name: str):
+        def register(setup):
+            self.cases[name] = setup
+            return setup
+
+        return register
+
+    def new_store(self, name: str) -> universal_lyrics.LyricsCacheStore:
+        path = self.workdir / f"{name}.db"
+        path.unlink(missing_ok=True)
+        return universal_lyrics.LyricsCacheStore(path, legacy_dir=None)
+
+    def close(self) -> None:
+        for cleanup in reversed(self.cleanups):
+            cleanup()
+
+
+def output_text(timeline, position: float) -> str:
+    return universal_lyrics.output_text(timeline, position, "Benchmark", "Benchmark Artist", "spotify")
+
+
+def register_cases(suite: Suite) -> None:
+    ul = universal_lyrics
+
+    for size, lrc, lines in (
+        ("short", suite.short_lrc, SHORT_LINES),
+        ("long", suite.long_lrc, LONG_LINES),
+    ):
+
+        def parse(lrc=lrc):
+            return lambda: ul.LyricsTimeline.parse(lrc)
+
+        suite.case(f"parse/{size}")(parse)
+
+        for name, func in (
+            ("find_current_line", ul.find_current_line),
+            ("output_json", ul.output_json),
+            ("output_waybar", ul.output_waybar),
+            ("output_text", output_text),
+        ):
+
+            def render(func=func, lrc=lrc, lines=lines):
+                timeline = ul.LyricsTimeline.parse(lrc)
+                spread = positions(lines)
+
+                def run():
+                    for position in spread:
+                        func(timeline, position)
+
+                run.calls = len(spread)
+                return run
+
+            suite.case(f"{name}/{size}")(render)
+
+    corpus = json.loads(CORPUS_PATH.read_text())
+    calls = [(e["title"], e["artist"], e["player"]) for e in corpus]
+
+    @suite.case("clean_title/uncached")
+    def clean_title_uncached():
+        raw = ul._clean_title.__wrapped__
+
+        def run():
+            for title, artist, player in calls:
+                raw(title, artist, "spotify" in player.lower())
+
+        run.calls = len(calls)
+        return run
+
+    @suite.case("clean_title/memoized")
+    def clean_title_memoized():
+        def run():
+            for args in calls:
+                ul.clean_title(*args)
+
+        run.calls = len(calls)
+        return run
+
+    @suite.case("get_lyrics/cache_hit")
+    def get_lyrics_hit():
+        store = suite.new_store("get_lyrics")
+        previous = ul._cache_store
+        ul._cache_store = store
+        suite.cleanups.append(lambda: setattr(ul, "_cache_store", previous))
+        title, artist, key = ul.resolve_track("Benchmark Song", "Benchmark Artist", "spotify")
+        store.put(key, title, artist, suite.short_lrc, "Lrclib")
+        return lambda: ul.get_lyrics(artist, title, key)
+
+    def daemon_case(sync: bool):
+        def setup():
+            store = suite.new_store(f"daemon_{sync}")
+            previous = ul._cache_store
+            ul._cache_store = store
+            suite.cleanups.append(lambda: setattr(ul, "_cache_store", previous))
+
+            daemon = ul.LyricsDaemon(output_file=suite.workdir / "daemon.json", serve=False)
+            suite.cleanups.append(lambda: daemon.fetch_executor.shutdown(wait=False))
+            suite.cleanups.append(daemon.refresher.shutdown)
+            suite.cleanups.append(daemon.prefetcher.shutdown)
+            bus_name = "org.mpris.MediaPlayer2.spotify"
+            properties = FakeProperties("Benchmark Song", "Benchmark Artist", 240.0)
+            daemon.monitor.players[bus_name] = ul.PlayerInfo(
+                bus_name, ":1.1", "Spotify", object(), properties, "Playing"
+            )
+            title, artist, key = ul.resolve_track("Benchmark Song", "Benchmark Artist", bus_name)
+            store.put(key, title, artist, suite.short_lrc, "Lrclib")
+
+            # First iteration creates the session and fetches (from the cache) in the pool
+            with contextlib.redirect_stderr(io.StringIO()):
+                daemon._process_iteration()
+                session = daemon.active_session()
+                deadline = time.monotonic() + 5.0
+                while session.track_manager.loading and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                daemon._process_iteration()
+
+            def run():
+                if sync:
+                    session.interpolator.needs_sync = True
+                daemon._process_iteration()
+
+            return run
+
+        return setup
+
+    # A boundary tick renders from the interpolated position; a sync also calls GetAll
+    suite.case("process_iteration/tick")(daemon_case(sync=False))
+    suite.case("process_iteration/sync")(daemon_case(sync=True))
+
+    def oneshot_case(hit: bool):
+        def setup():
+            bindir = suite.workdir / "bin"
+            bindir.mkdir(exist_ok=True)
+            playerctl = bindir / "playerctl"
+            playerctl.write_text(FAKE_PLAYERCTL)
+            playerctl.chmod(0o755)
+            old_path = os.environ["PATH"]
+            os.environ["PATH"] = f"{bindir}{os.pathsep}{old_path}"
+            suite.cleanups.append(lambda: os.environ.__setitem__("PATH", old_path))
+
+            saved = {
+                name: getattr(ul, name)
+                for name in ("load_dbus", "_cache_store", "_lyrics_fetcher", "CACHE_DB_PATH")
+            }
+            saved_module = sys.modules.get("syncedlyrics")
+            saved_argv = sys.argv
+
+            def restore():
+                for name, value in saved.items():
+                    setattr(ul, name, value)
+                if saved_module is None:
+                    sys.modules.pop("syncedlyrics", None)
+                else:
+                    sys.modules["syncedlyrics"] = saved_module
+                sys.argv = saved_argv
+
+            suite.cleanups.append(restore)
+            # Always take the playerctl path, even where dbus-python is installed
+            ul.load_dbus = lambda: False
+            sys.modules["syncedlyrics"] = fake_syncedlyrics(suite.short_lrc)
+            db_path = suite.workdir / f"oneshot_{hit}.db"
+
+            def run():
+                # Fresh process state: no fetcher or memoized titles, a newly opened store.
+                # The store is opened here with legacy_dir=None: main() would otherwise
+                # migrate (and delete) the user's real legacy cache files.
+                ul._lyrics_fetcher = None
+                ul._clean_title.cache_clear()
+                if not hit:
+                    db_path.unlink(missing_ok=True)
+                ul._cache_store = ul.LyricsCacheStore(db_path, legacy_dir=None)
+                sys.argv = [
+                    "lyrics", "--no-daemon", "--format", "waybar", "--cache-path", str(db_path),
+                ]
+                with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+                    io.StringIO()
+                ):
+                    try:
+                        ul.main()
+                    except SystemExit:
+                        pass
+
+            run()  # a hit needs the entry in place
+            return run
+
+        return setup
+
+    suite.case("oneshot_main/cache_hit")(oneshot_case(hit=True))
+    suite.case("oneshot_main/cache_miss")(oneshot_case(hit=False))
+
+
+def measure(run, repeat: int, min_time: float) -> dict:
+    """Time `run` with timeit; per-call figures divide by run.calls when set."""
+    timer = timeit.Timer(run)
+    loops = 1
+    while True:
+        elapsed = timer.timeit(loops)
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+    calls = getattr(run, "calls", 1)
+    samples = [t / loops / calls * 1e6 for t in timer.repeat(repeat, loops)]
+    return {
+        "min_us": round(min(samples), 4),
+        "median_us": round(statistics.median(samples), 4),
+        "loops": loops,
+        "calls_per_loop": calls,
+        "repeat": repeat,
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return "unknown"
+
+
+def compare(results: dict, baseline_path: Path, threshold: float) -> int:
+    """Print min-time ratios against a baseline; return the number of regressions."""
+    baseline = json.loads(baseline_path.read_text())
+    print(f"\nvs {baseline_path.name} ({baseline.get('commit', '?')}):")
+    regressions = 0
+    for name, result in results["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            print(f"  {name:<32} (new)")
+            continue
+        ratio = result["min_us"] / old["min_us"] if old["min_us"] else float("inf")
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"  {name:<32} {old['min_us']:>12.2f} -> {result['min_us']:>12.2f} us  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-k", dest="pattern", help="Only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing samples per case")
+    parser.add_argument(
+        "--min-time", type=float, default=0.1, help="Seconds each sample should at least take"
+    )
+    parser.add_argument("-o", "--output", type=Path, help="Results file (default: results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="Earlier results file to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=1.25, help="Slowdown ratio reported as a regression"
+    )
+    parser.add_argument("--list", action="store_true", help="List case names and exit")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="lyrics-bench-") as tmp:
+        suite = Suite(Path(tmp))
+        register_cases(suite)
+        if args.list:
+            print("\n".join(suite.cases))
+            return
+
+        commit = git_revision()
+        results = {
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": {},
+        }
+        try:
+            for name, setup in suite.cases.items():
+                if args.pattern and args.pattern not in name:
+                    continue
+                result = measure(setup(), args.repeat, args.min_time)
+                results["results"][name] = result
+                print(f"{name:<32} {result['min_us']:>12.2f} us  (median {result['median_us']:.2f})")
+        finally:
+            suite.close()
+
+    output = args.output or RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"results written to {output}")
+
+    if args.compare:
+        sys.exit(1 if compare(results, args.compare, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""LyricsCacheStore on a temporary database; the legacy directory is a temp dir too."""
+
+import json
+import os
+import time
+
+import pytest
+
+import universal_lyrics as ul
+
+SYNCED = "[00:01.00]first line\n[00:05.00]second line"
+
+
+@pytest.fixture
+def legacy_dir(tmp_path):
+    directory = tmp_path / "legacy"
+    directory.mkdir()
+    return directory
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ul.LyricsCacheStore(tmp_path / "lyrics.db", legacy_dir=None)
+
+
+def test_legacy_migration(tmp_path, legacy_dir):
+    (legacy_dir / "withmeta.lrc").write_text(SYNCED)
+    (legacy_dir / "withmeta.meta").write_text(json.dumps({"title": "Song", "artist": "Artist"}))
+    os.utime(legacy_dir / "withmeta.lrc", (1_700_000_000, 1_700_000_000))
+    (legacy_dir / "bare.lrc").write_text("plain words")
+    (legacy_dir / "broken.lrc").write_bytes(b"\xff\xfe\xfa")
+    (legacy_dir / "broken.meta").write_text("{not json")
+    (legacy_dir / "unrelated.txt").write_text("kept")
+
+    store = ul.LyricsCacheStore(tmp_path / "lyrics.db", legacy_dir=legacy_dir)
+
+    entry = store.get("withmeta")
+    assert (entry.title, entry.artist, entry.lrc) == ("Song", "Artist", SYNCED)
+    assert entry.synced
+    assert entry.fetched_at == 1_700_000_000
+    assert store.lookup("withmeta", "Song", "Artist") == SYNCED
+    # No metadata: trusted for any title, as the file cache did
+    assert store.lookup("bare", "Anything", "Anyone") == "plain words"
+    assert store.get("broken") is None
+    # Migrated (and corrupt) files are removed, other files are left alone
+    assert sorted(p.name for p in legacy_dir.iterdir()) == ["unrelated.txt"]
+
+
+def test_legacy_migration_runs_once(tmp_path, legacy_dir):
+    ul.LyricsCacheStore(tmp_path / "lyrics.db", legacy_dir=legacy_dir)
+    (legacy_dir / "late.lrc").write_text(SYNCED)
+    store = ul.LyricsCacheStore(tmp_path / "lyrics.db", legacy_dir=legacy_dir)
+    assert store.get("late") is None
+    assert (legacy_dir / "late.lrc").exists()
+
+
+def test_lookup_drops_mismatched_metadata(store):
+    store.put("key", "Song", "Artist", SYNCED, "Lrclib")
+    assert store.lookup("key", "Other Song", "Artist") is None
+    assert store.get("key") is None
+
+
+def test_eviction_by_count_and_age(store, monkeypatch):
+    monkeypatch.setattr(store, "EVICT_EVERY", 1)
+    monkeypatch.setattr(store, "MAX_ENTRIES", 3)
+    now = time.time()
+    store.put("too-old", "Old", "Artist", SYNCED, fetched_at=now - store.MAX_AGE - 1)
+    for i in range(5):
+        store.put(f"key{i}", f"Song {i}", "Artist", SYNCED, fetched_at=now - 100 + i)
+
+    keys = [k for k in ["too-old"] + [f"key{i}" for i in range(5)] if store.get(k)]
+    assert keys == ["key2", "key3", "key4"]
+    # Trigram postings of evicted rows go with them
+    assert store.find_similar("Song 0", "Artist") is None
+
+
+def test_eviction_by_size(store, monkeypatch):
+    monkeypatch.setattr(store, "EVICT_EVERY", 1)
+    monkeypatch.setattr(store, "MAX_BYTES", 2 * len(SYNCED))
+    now = time.time()
+    for i in range(4):
+        store.put(f"key{i}", f"Song {i}", "Artist", SYNCED, fetched_at=now + i)
+    assert [i for i in range(4) if store.get(f"key{i}")] == [2, 3]
+
+
+def test_negative_backoff_doubles_up_to_cap(store):
+    hour = store.NEGATIVE_RETRY_BASE
+    delays = []
+    for _ in range(5):
+        store.put("miss", "Song", "Artist", "", fetched_at=1000.0)
+        entry = store.get("miss")
+        delays.append(entry.next_retry_at - entry.fetched_at)
+    assert delays == [hour, 2 * hour, 4 * hour, 8 * hour, 16 * hour]
+    assert store.get("miss").attempts == 5
+
+    for _ in range(10):
+        store.put("miss", "Song", "Artist", "", fetched_at=1000.0)
+    assert store.get("miss").next_retry_at == 1000.0 + store.NEGATIVE_TTL
+
+    # Finding lyrics resets the schedule for a later miss
+    store.put("miss", "Song", "Artist", SYNCED)
+    store.put("miss", "Song", "Artist", "", fetched_at=1000.0)
+    assert store.get("miss").attempts == 1
+
+
+def test_negative_entry_expires(store):
+    now = time.time()
+    store.put("fresh", "Song", "Artist", "", fetched_at=now)
+    store.put("due", "Other", "Artist", "", fetched_at=now - 2 * store.NEGATIVE_RETRY_BASE)
+    store.put("found", "Third", "Artist", SYNCED, fetched_at=now - store.NEGATIVE_TTL)
+
+    assert store.lookup("fresh", "Song", "Artist") == ""
+    assert store.lookup("due", "Other", "Artist") is None
+    assert store.lookup("found", "Third", "Artist") == SYNCED
+    assert [e.key for e in store.expired_misses(limit=5)] == ["due"]
+
+
+@pytest.mark.parametrize(
+    "title, artist, duration, hit",
+    [
+        ("アイドル", "YOASOBI", None, True),  # kana folding
+        ("あいどる", "YOASOBI - Topic", None, True),  # channel noise in the artist
+        ("ＡＩＤＯＲＵ", "YOASOBI", None, False),  # different title
+        ("あいどる", "Ado", None, False),  # artist guard
+        ("あいどる", "", None, False),  # unknown artist only matches unknown
+        ("あいどる", "YOASOBI", 213.0, True),  # lengths within FUZZY_MAX_DURATION_DIFF
+        ("あいどる", "YOASOBI", 260.0, False),  # another edit of the song
+    ],
+)
+def test_find_similar(store, title, artist, duration, hit):
+    store.put("idol", "あいどる", "YOASOBI", SYNCED, "Lrclib", duration=210.0)
+    store.put("miss", "アイドル", "YOASOBI", "")  # negative entries are never matched
+    similar = store.find_similar(title, artist, duration)
+    if hit:
+        entry, score = similar
+        assert entry.key == "idol" and score >= store.FUZZY_THRESHOLD
+    else:
+        assert similar is None
+
+
+def test_find_similar_keeps_numbered_parts_apart(store):
+    store.put("part1", "Song Part 1", "Artist", SYNCED)
+    assert store.find_similar("Song Part 2", "Artist") is None
+    assert store.find_similar("song part 1", "Artist")[0].key == "part1"
+
+
+def test_fuzzy_index_follows_overwrites(store):
+    store.put("key", "First Title", "Artist", SYNCED)
+    store.put("key", "Second Title", "Artist", SYNCED)
+    assert store.find_similar("First Title", "Artist") is None
+    assert store.find_similar("Second Title", "Artist")[0].key == "key"
+    store.put("key", "Second Title", "Artist", "")
+    assert store.find_similar("Second Title", "Artist") is None
+
+
+def test_put_keeps_higher_scored_lyrics(store):
+    better = "[length: 03:30.00]\n" + SYNCED
+    assert store.put("key", "Song", "Artist", better, "Musixmatch", duration=210.0, score=1.0)
+    # The original, lower-scored write arriving after a re-rank is dropped
+    assert not store.put("key", "Song", "Artist", SYNCED, "Lrclib", duration=210.0, score=0.4)
+    assert not store.put("key", "Song", "Artist", SYNCED, "Lrclib", score=1.0)
+    entry = store.get("key")
+    assert (entry.provider, entry.lrc, entry.score) == ("Musixmatch", better, 1.0)
+
+    # Unscored writes (fuzzy aliases, migration) and other titles always replace
+    assert store.put("key", "Song", "Artist", SYNCED, "Lrclib")
+    store.put("key", "Song", "Artist", better, "Musixmatch", score=1.0)
+    assert store.put("key", "Song (Live)", "Artist", SYNCED, "Lrclib", score=0.1)
+    assert store.get("key").title == "Song (Live)"
+
+
+@pytest.mark.parametrize(
+    "lrc, duration, title, expected",
+    [
+        ("[length: 03:30.00]\n" + SYNCED, 210.0, "", 1.0),
+        ("[length: 03:25.00]\n" + SYNCED, 210.0, "", 0.5),
+        ("[length: 04:00.00]\n" + SYNCED, 210.0, "", 0.0),
+        ("[00:01.00]a\n[03:20.00]b", 210.0, "", 1.0),  # ends within MAX_OUTRO
+        ("[00:01.00]a\n[03:40.00]b", 210.0, "", 0.0),  # runs past the end
+        ("[ti:Song]\n" + SYNCED, None, "Song", 1.0),
+        (SYNCED, None, "Song", None),
+    ],
+)
+def test_score_lyrics(lrc, duration, title, expected):
+    score = ul.score_lyrics(lrc, duration, title)
+    if expected is None:
+        assert score is None
+    else:
+        assert score == pytest.approx(expected)
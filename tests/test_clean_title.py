@@ -0,0 +1,58 @@
+"""clean_title() against the recorded corpus, and rules-file validation."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+import universal_lyrics as ul
+
+CORPUS = json.loads(
+    (Path(__file__).resolve().parent.parent / "benchmarks" / "title_corpus.json").read_text()
+)
+
+
+@pytest.mark.parametrize("entry", CORPUS, ids=[e["title"][:40] for e in CORPUS])
+def test_corpus(entry):
+    title, artist, cache_key = ul.resolve_track(entry["title"], entry["artist"], entry["player"])
+    assert {
+        "title": title,
+        "artist": artist,
+        "cache_key": cache_key,
+        "query": ul.build_search_query(title, artist),
+    } == entry["expected"]
+
+
+@pytest.fixture
+def rules_file(tmp_path, monkeypatch):
+    """Write a rules file and make clean_title() use it."""
+    path = tmp_path / "rules.json"
+    monkeypatch.setattr(ul, "TITLE_RULES_PATH", path)
+    monkeypatch.setattr(ul, "_title_rules", None)
+    ul._clean_title.cache_clear()
+    yield path
+    ul._clean_title.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        {"artist": "Foo", "extract": "Live"},  # no capture group
+        {"artist": "Foo", "extract": "(unclosed"},
+        {"artist": "Foo"},
+        {"artist": 1, "extract": "(.+)"},
+        "not a rule",
+    ],
+)
+def test_malformed_rule_is_ignored(rules_file, rule):
+    valid = {"artist": "Foo", "extract": "<(.+)>"}
+    rules_file.write_text(json.dumps({"artist_titles": [rule, valid]}))
+    assert ul.clean_title("Live <Song>", "Foo", "brave") == ("Song", "")
+    assert ul.clean_title("Live", "Foo", "brave") == ("Live", "")
+
+
+def test_malformed_file_is_ignored(rules_file):
+    rules_file.write_text(json.dumps({"artist_search": {"A": "B"}, "artist_titles": {}}))
+    rules = ul.get_title_rules()
+    assert rules.artist_search == ul.ARTIST_SEARCH_MAPPINGS
+    assert len(rules.artist_titles) == len(ul.ARTIST_TITLE_RULES)
@@ -0,0 +1,56 @@
+"""--follow relaying a daemon's stream: daemon found, no daemon, reader gone."""
+
+import io
+import socket
+import threading
+
+import pytest
+
+import universal_lyrics as ul
+
+RECORDS = ['{"text": "first"}\n', '{"text": "second"}\n']
+
+
+@pytest.fixture
+def daemon_socket(tmp_path):
+    """A fake daemon that answers one subscription with RECORDS, then closes."""
+    directory = tmp_path / "run"
+    directory.mkdir(mode=0o700)
+    path = directory / "lyrics-daemon.sock"
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    server.listen(1)
+    requests = []
+
+    def serve():
+        conn, _ = server.accept()
+        with conn:
+            requests.append(conn.makefile("r").readline())
+            conn.sendall("".join(RECORDS).encode())
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield path, requests
+    server.close()
+
+
+def test_relays_records(daemon_socket, capsys):
+    path, requests = daemon_socket
+    assert ul.follow_daemon("waybar", path) is True
+    assert requests == ["subscribe waybar\n"]
+    assert capsys.readouterr().out == "".join(RECORDS)
+
+
+def test_no_daemon(tmp_path):
+    tmp_path.chmod(0o700)
+    assert ul.follow_daemon("json", tmp_path / "missing.sock") is False
+
+
+def test_closed_stdout_propagates(daemon_socket, monkeypatch):
+    class ClosedPipe(io.StringIO):
+        def write(self, text):
+            raise BrokenPipeError
+
+    monkeypatch.setattr("sys.stdout", ClosedPipe())
+    with pytest.raises(BrokenPipeError):
+        ul.follow_daemon("json", daemon_socket[0])
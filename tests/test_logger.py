@@ -0,0 +1,32 @@
+"""Logger rate limiting is per template; explicit reports bypass it."""
+
+import universal_lyrics as ul
+
+
+def test_rate_limit_is_per_template(capsys):
+    log = ul.Logger("info")
+    for i in range(log.BURST + 2):
+        log.info("Lyrics fetch failed: %s", i)
+    assert log.info("Metrics report") is True
+    assert log.error("Tick failed: %s", "boom") is True
+    assert log.suppressed == 2
+    err = capsys.readouterr().err
+    assert f"[INFO] Lyrics fetch failed: {log.BURST - 1}\n" in err
+    assert f"Lyrics fetch failed: {log.BURST}\n" not in err
+
+
+def test_unlimited_messages_are_not_counted(capsys):
+    log = ul.Logger("info")
+    for _ in range(log.BURST + 5):
+        assert log.info("%s", "report", limited=False) is True
+    assert log.info("%s", "after") is True
+    assert log.suppressed == 0
+    assert capsys.readouterr().err.count("[INFO] report\n") == log.BURST + 5
+
+
+def test_disabled_level_is_not_formatted():
+    class Loud:
+        def __str__(self):
+            raise AssertionError("formatted")
+
+    assert ul.Logger("error").info("value: %s", Loud()) is False
@@ -0,0 +1,148 @@
+"""LyricsFetcher against local stub providers: no network, no syncedlyrics."""
+
+import threading
+import time
+
+import pytest
+
+import universal_lyrics as ul
+
+SYNCED = "[00:01.00]first line\n[00:05.00]second line\n[03:20.00]last line"
+PLAIN = "first line\nsecond line"
+
+
+def answer(lrc, delay=0.0):
+    """Stub provider returning `lrc` after `delay` seconds."""
+
+    def provider(query, timeout):
+        time.sleep(delay)
+        return lrc
+
+    return provider
+
+
+@pytest.fixture
+def release():
+    """Event that hung stubs wait on; set at teardown so their threads finish."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def hung(release):
+    """Stub provider that ignores its timeout until the test ends."""
+
+    def provider(query, timeout):
+        release.wait()
+        return SYNCED
+
+    return provider
+
+
+def test_first_synced_result_wins():
+    fetcher = ul.LyricsFetcher(
+        {"slow": answer(SYNCED.replace("first", "slow"), delay=1.0), "fast": answer(SYNCED)},
+        {"slow": 2.0, "fast": 2.0},
+    )
+    start = time.monotonic()
+    lrc, provider, score = fetcher.search("query")
+    assert (lrc, provider, score) == (SYNCED, "fast", None)
+    assert time.monotonic() - start < 0.5
+
+
+def test_plain_fallback_after_deadline(release):
+    fetcher = ul.LyricsFetcher(
+        {"synced": hung(release), "plain": answer(PLAIN)},
+        {"synced": 0.2, "plain": 0.2},
+    )
+    start = time.monotonic()
+    assert fetcher.search("query") == (PLAIN, "plain", None)
+    assert 0.2 <= time.monotonic() - start < 0.5
+    assert fetcher.stats["synced"].timeouts == 1
+    assert fetcher.stats["plain"].plain_hits == 1
+
+
+def test_timeout_accounting(release):
+    fetcher = ul.LyricsFetcher({"dead": hung(release), "empty": answer(None)}, {"dead": 0.1})
+    before = ul.METRICS.snapshot()["counters"].get('provider_timeouts_total{provider="dead"}', 0)
+
+    assert fetcher.search("query") is None
+    stats = fetcher.stats["dead"]
+    assert (stats.requests, stats.timeouts, stats.skipped) == (1, 1, 0)
+    assert fetcher.stats["empty"].misses == 1
+    after = ul.METRICS.snapshot()["counters"]['provider_timeouts_total{provider="dead"}']
+    assert after == before + 1
+
+    # The hung call still holds its thread: no second call, the other provider still runs
+    assert fetcher.search("query") is None
+    assert (stats.requests, stats.skipped) == (1, 1)
+    assert fetcher.stats["empty"].misses == 2
+
+
+def test_no_answer_raises_and_is_not_cached(release, tmp_path, monkeypatch):
+    fetcher = ul.LyricsFetcher({"dead": hung(release)}, {"dead": 0.1})
+    with pytest.raises(TimeoutError):
+        fetcher.search("query")
+
+    monkeypatch.setattr(ul, "_lyrics_fetcher", fetcher)
+    store = ul.LyricsCacheStore(tmp_path / "lyrics.db", legacy_dir=None)
+    monkeypatch.setattr(ul, "_cache_store", store)
+    with pytest.raises(TimeoutError):
+        ul.get_lyrics("Artist", "Song", "key")
+    assert ul.get_cache_store().get("key") is None
+
+
+def test_unreachable_track_is_retried(tmp_path, monkeypatch):
+    online = threading.Event()
+
+    def provider(query, timeout):
+        if not online.is_set():
+            raise ConnectionError("offline")
+        return SYNCED
+
+    monkeypatch.setattr(ul, "_lyrics_fetcher", ul.LyricsFetcher({"net": provider}))
+    store = ul.LyricsCacheStore(tmp_path / "lyrics.db", legacy_dir=None)
+    monkeypatch.setattr(ul, "_cache_store", store)
+    monkeypatch.setattr(ul.TrackStateManager, "UNREACHABLE_RETRY", 0.2)
+    ready = threading.Event()
+    tracks = ul.TrackStateManager(on_lyrics_ready=ready.set)
+    try:
+        tracks.update_track(
+            {"trackid": "1", "title": "Retry Song", "artist": "Artist", "length_us": 0},
+            "spotify",
+        )
+        assert ready.wait(2.0)
+        assert tracks.snapshot()[:2] == (False, "")
+        assert store.get(tracks.current_cache_key) is None
+
+        # Back online: the retry picks the track up without a track change
+        ready.clear()
+        online.set()
+        assert ready.wait(2.0)
+        assert tracks.snapshot()[1] == SYNCED
+    finally:
+        tracks.shutdown()
+
+
+def test_late_better_result_is_reported(monkeypatch):
+    monkeypatch.setattr(ul.LyricsFetcher, "RANK_GRACE", 0.1)
+    # Track is 205 s long: "short" ends a few minutes early, "exact" matches its [length:]
+    short = "[00:01.00]line\n[00:30.00]line"
+    exact = "[length: 03:25.00]\n" + SYNCED
+    fetcher = ul.LyricsFetcher(
+        {"short": answer(short), "exact": answer(exact, delay=0.4)},
+        {"short": 2.0, "exact": 2.0},
+    )
+    reported = []
+    done = threading.Event()
+
+    def on_better(lrc, provider, score):
+        reported.append((lrc, provider, score))
+        done.set()
+
+    lrc, provider, score = fetcher.search("query", duration=205.0, on_better=on_better)
+    assert (lrc, provider) == (short, "short")
+    assert score < fetcher.GOOD_MATCH
+
+    assert done.wait(2.0)
+    assert reported == [(exact, "exact", 1.0)]
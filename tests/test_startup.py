@@ -0,0 +1,31 @@
+"""Importing universal_lyrics must not load the heavy optional modules."""
+
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+IMPORTTIME_RE = re.compile(r"^import time:\s+\d+ \|\s+\d+ \|\s+(\S+)$")
+
+
+@pytest.fixture(scope="module")
+def imported() -> set[str]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import universal_lyrics"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {m.group(1) for m in map(IMPORTTIME_RE.match, result.stderr.splitlines()) if m}
+    assert "universal_lyrics" in modules
+    return modules
+
+
+@pytest.mark.parametrize("module", ["dbus", "gi", "pympris", "syncedlyrics", "sqlite3"])
+def test_not_imported_at_load(imported, module):
+    eager = sorted(name for name in imported if name == module or name.startswith(module + "."))
+    assert not eager
@@ -0,0 +1,107 @@
+"""SyncPolicy learning from synthetic MPRIS snapshots fed through PositionInterpolator."""
+
+import pytest
+
+import universal_lyrics as ul
+
+MIN, MAX = ul.SyncPolicy.MIN_INTERVAL, ul.SyncPolicy.MAX_INTERVAL
+
+
+class FakePlayer:
+    """A player whose clock runs `skew` fast relative to ours; synced at the policy's pace."""
+
+    def __init__(self, skew: float = 0.0):
+        self.skew = skew
+        self.time = 100.0
+        self.position = 10.0
+        self.interpolator = ul.PositionInterpolator(ul.SyncPolicy("Test"))
+        self.sync(0.0)
+
+    def sync(self, elapsed: float, **state) -> None:
+        self.time += elapsed
+        self.position += elapsed * (1.0 + self.skew)
+        self.interpolator.update_from_mpris(
+            {
+                "position": self.position,
+                "timestamp": self.time,
+                "rate": 1.0,
+                "status": "Playing",
+                "trackid": "/track/1",
+                **state,
+            }
+        )
+
+    def run(self, syncs: int) -> list[float]:
+        """Sync `syncs` times, each after the current interval; returns the intervals."""
+        intervals = []
+        for _ in range(syncs):
+            self.sync(self.interpolator.sync_interval)
+            intervals.append(self.policy.interval)
+        return intervals
+
+    @property
+    def policy(self) -> ul.SyncPolicy:
+        return self.interpolator.policy
+
+
+@pytest.mark.parametrize(
+    "skew, expected",
+    [
+        (0.0, MAX),  # no drift: widen to the maximum
+        (0.0001, MAX),  # 0.1 ms/s: tolerance reached after 250 s, capped
+        (0.005, 5.0),  # 5 ms/s -> DRIFT_TOLERANCE / rate
+        (0.02, 1.25),
+        (0.1, MIN),  # 100 ms/s: resync as often as allowed
+    ],
+)
+def test_interval_converges_within_bounds(skew, expected):
+    player = FakePlayer(skew)
+    intervals = player.run(20)
+    assert all(MIN <= interval <= MAX for interval in intervals)
+    assert intervals[-1] == pytest.approx(expected)
+    assert player.policy.samples == 20
+
+
+def test_interval_narrows_when_drift_appears_and_widens_again():
+    player = FakePlayer()
+    assert player.run(3)[-1] == MAX
+
+    player.skew = 0.01
+    narrowing = player.run(15)
+    assert narrowing == sorted(narrowing, reverse=True)
+    assert narrowing[0] < MAX and narrowing[-1] == pytest.approx(2.5, rel=0.01)
+
+    player.skew = 0.0
+    widening = player.run(15)
+    assert widening == sorted(widening)
+    assert widening[-1] > 2 * narrowing[-1]
+
+
+def test_jumps_and_short_gaps_are_not_drift():
+    player = FakePlayer(0.005)
+    player.run(5)
+    learned = player.policy.interval
+    player.position += 30.0  # unsignalled seek
+    player.sync(2.0)
+    player.sync(0.1)  # too short to measure a rate
+    assert player.policy.interval == learned
+    assert player.policy.jumps == 1
+    assert player.policy.samples == 5
+
+
+def test_paused_and_new_track_snapshots_are_not_drift():
+    player = FakePlayer(0.005)
+    player.sync(5.0, status="Paused")
+    player.sync(5.0)
+    player.sync(5.0, trackid="/track/2")
+    assert player.policy.samples == 0
+    assert player.policy.interval == ul.SyncPolicy.INITIAL_INTERVAL
+
+
+def test_rate_change_resets_to_minimum():
+    player = FakePlayer()
+    player.run(5)
+    player.sync(5.0, rate=1.5)
+    assert player.policy.interval == MIN
+    assert player.policy.drift_rate is None
+    assert player.policy.rate_changes == 1
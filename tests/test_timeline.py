@@ -0,0 +1,150 @@
+"""LyricsTimeline lookups against the original find_current_line() line scan."""
+
+import re
+
+import pytest
+
+import universal_lyrics as ul
+
+
+def baseline_find_current_line(lyrics_lines: list[str], position: float) -> int:
+    """find_current_line() as it was before the timeline index: a regex scan per call."""
+    for i, line in enumerate(lyrics_lines):
+        match = re.match(r"^\[(\d+:\d+\.\d+)\]", line)
+        if not match:
+            continue
+        line_time = ul.parse_timestamp(match.group(0))
+        next_time = 99999
+        if i + 1 < len(lyrics_lines):
+            next_match = re.match(r"^\[(\d+:\d+\.\d+)\]", lyrics_lines[i + 1])
+            if next_match:
+                next_time = ul.parse_timestamp(next_match.group(0))
+        if line_time <= position < next_time:
+            return i
+    return -1
+
+
+LRCS = {
+    "simple": "[00:01.00]one\n[00:04.50]two\n[00:09.00]three\n[01:10.25]four",
+    "equal timestamps": "[00:01.00]one\n[00:05.00]two a\n[00:05.00]two b\n[00:08.00]three",
+    "late start": "[00:30.00]only line",
+    "dense": "\n".join(f"[00:{i // 100:02d}.{i % 100:02d}]line {i}" for i in range(0, 500, 7)),
+}
+POSITIONS = [-1.0, 0.0, 0.99, 1.0, 1.01, 4.5, 4.99, 5.0, 6.0, 8.0, 9.0, 30.0, 70.25, 500.0]
+
+
+@pytest.mark.parametrize("name", LRCS)
+def test_index_matches_baseline(name):
+    lines = LRCS[name].split("\n")
+    timeline = ul.LyricsTimeline.parse(LRCS[name])
+    # Playback sweep (cursor steps), then seeks backwards and forwards (bisect)
+    sweep = [i * 0.05 for i in range(int(80 / 0.05))]
+    for position in sweep + POSITIONS[::-1] + POSITIONS:
+        expected = baseline_find_current_line(lines, position)
+        index = timeline.index_at(position)
+        assert index == expected, position
+        if index >= 0:
+            assert timeline.texts[index] == lines[expected].split("]", 1)[1]
+
+
+def test_unsorted_and_repeated_tags():
+    timeline = ul.LyricsTimeline.parse("[00:20.00]b\n[00:10.00][00:30.00]a\n[00:05]c")
+    assert list(timeline.times) == [5.0, 10.0, 20.0, 30.0]
+    assert timeline.texts == ("c", "a", "b", "a")
+    assert [timeline.index_at(p) for p in (4.0, 5.0, 15.0, 25.0, 35.0)] == [-1, 0, 1, 2, 3]
+
+
+def test_offset_tag_shifts_lines():
+    timeline = ul.LyricsTimeline.parse("[offset:+500]\n[00:01.00]one\n[00:03.00]two")
+    assert list(timeline.times) == [0.5, 2.5]
+
+
+def test_plain_and_empty_lyrics():
+    plain = ul.LyricsTimeline.parse("first line\nsecond line")
+    assert not plain.is_synced and plain.texts == ("first line", "second line")
+    assert plain.index_at(10.0) == -1
+    assert len(ul.LyricsTimeline.parse("  \n")) == 0
+
+
+def test_next_boundary_is_next_line_start():
+    timeline = ul.LyricsTimeline.parse(LRCS["simple"])
+    assert timeline.next_boundary(0.0) == 1.0
+    assert timeline.next_boundary(4.5) == 9.0
+    assert timeline.next_boundary(80.0) is None
+
+
+ENHANCED = (
+    "[00:12.00]<00:12.00>Hello <00:12.40>world <00:13.10>\n"  # trailing end tag
+    "[00:14.00]plain line\n"
+    "[00:15.00]lead <00:15.50>tagged\n"  # untagged text starts with the line
+    "[00:10.00][01:20.00]<00:10.00>Re <00:10.50>peat"  # repeated: words shift along
+)
+
+
+@pytest.mark.parametrize(
+    "text, clean, words",
+    [
+        ("<00:01.00>a <00:01.50>b <00:02.00>", "a b", [(1.0, 0), (1.5, 2), (2.0, 3)]),
+        (" <00:01.00> a <00:01.50>b", "a b", [(1.0, 0), (1.5, 2)]),
+        ("<00:01.00><00:01.20>a", "a", [(1.2, 0)]),  # last of several tags wins
+        ("no tags", "no tags", []),
+    ],
+)
+def test_split_word_tags(text, clean, words):
+    assert ul.split_word_tags(text) == (clean, words)
+
+
+def test_word_spans():
+    timeline = ul.LyricsTimeline.parse(ENHANCED)
+    assert timeline.texts == ("Re peat", "Hello world", "plain line", "lead tagged", "Re peat")
+    assert [timeline.words(i) for i in range(len(timeline))] == [
+        [("Re ", 10.0), ("peat", 10.5)],
+        [("Hello ", 12.0), ("world", 12.4)],  # the end tag is not a word
+        [],
+        [("lead ", 15.0), ("tagged", 15.5)],
+        [("Re ", 80.0), ("peat", 80.5)],
+    ]
+    # End tag, else the next line's start, else unknown
+    assert [timeline.line_end(i) for i in range(len(timeline))] == [12.0, 13.1, 15.0, 80.0, None]
+
+
+@pytest.mark.parametrize(
+    "position, progress, word",
+    [
+        (12.0, 0.0, 0),
+        (12.2, 0.182, 0),
+        (12.4, 0.364, 1),
+        (13.05, 0.955, 1),
+        (13.5, 1.0, 1),  # after the end tag, before the next line
+    ],
+)
+def test_progress(position, progress, word):
+    timeline = ul.LyricsTimeline.parse(ENHANCED)
+    index = timeline.index_at(position)
+    assert index == 1
+    fields = ul.build_line_timing(timeline, index, position, progress=True)
+    assert fields == {
+        "start": 12.0,
+        "end": 13.1,
+        "words": ["Hello ", "world"],
+        "word_starts": [12.0, 12.4],
+        "progress": progress,
+        "word": word,
+    }
+
+
+def test_progress_without_words_or_end():
+    timeline = ul.LyricsTimeline.parse("[00:01.00]one\n[00:05.00]last")
+    assert ul.build_line_timing(timeline, 0, 3.0, progress=True) == {
+        "start": 1.0, "end": 5.0, "progress": 0.5,
+    }
+    # Last line: no end to measure against
+    assert ul.build_line_timing(timeline, 1, 9.0, progress=True) == {"start": 5.0}
+
+
+def test_daemon_payload_is_stable_within_a_line():
+    timeline = ul.LyricsTimeline.parse(ENHANCED)
+    payloads = {str(ul.build_json_output(timeline, p)) for p in (12.0, 12.5, 13.05, 13.9)}
+    assert len(payloads) == 1
+    one_shot = ul.build_json_output(timeline, 12.5, progress=True)["lines"][1]
+    assert (one_shot["progress"], one_shot["word"]) == (0.455, 1)
@@ -0,0 +1,41 @@
+"""warm_cache() accounting with a stub provider."""
+
+import pytest
+
+import universal_lyrics as ul
+
+SYNCED = "[00:01.00]first line\n[00:05.00]second line"
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    def provider(query, timeout):
+        if "Offline" in query:
+            raise ConnectionError("unreachable")
+        return SYNCED if "Found" in query else None
+
+    monkeypatch.setattr(ul, "_lyrics_fetcher", ul.LyricsFetcher({"stub": provider}))
+    store = ul.LyricsCacheStore(tmp_path / "lyrics.db", legacy_dir=None)
+    monkeypatch.setattr(ul, "_cache_store", store)
+    return store
+
+
+def test_warm_cache_counts(store, capsys):
+    title, artist, key = ul.resolve_track("Cached Song", "Artist", "")
+    store.put(key, title, artist, SYNCED, "stub")
+    tracks = [
+        ("Artist", "Found Song"),
+        ("Artist", "Found Song"),  # duplicate
+        ("Artist", "Missing Song"),
+        ("Artist", "Offline Song"),
+        ("Artist", "Cached Song"),
+        ("Artist", "()"),  # nothing left after cleaning
+    ]
+    stats = ul.warm_cache(tracks, workers=2, rate=0)
+    assert stats["tracks"] == 6
+    assert (stats["duplicates"], stats["no_title"], stats["cached"]) == (1, 1, 1)
+    assert (stats["fetched"], stats["synced"], stats["not_found"]) == (2, 1, 1)
+    # No provider answered: an error, not "not found", and nothing cached
+    assert stats["errors"] == 1
+    assert store.get(ul.resolve_track("Offline Song", "Artist", "")[2]) is None
+    assert "(4 unique, 1 without title)" in ul.format_warm_stats(stats)
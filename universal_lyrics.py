@@ -8,33 +8,87 @@ import argparse
 import hashlib
 import html
 import json
+import math
 import os
 import re
 import signal
-import subprocess
 import sys
+import threading
 import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional
 
-import syncedlyrics
+# Optional/heavy modules are imported on first use so one-shot calls start fast.
+# syncedlyrics is imported by the provider wrapper only when a search runs.
+dbus = None
+pympris = None
+GLib = None
+DBusGMainLoop = None
 
-try:
-    import pympris
 
-    HAS_PYMPRIS = True
-except ImportError:
-    HAS_PYMPRIS = False
+def load_dbus() -> bool:
+    """Import dbus-python on first use; False if it is not installed."""
+    global dbus
+    if dbus is None:
+        try:
+            import dbus as dbus_module
+        except ImportError:
+            return False
+        dbus = dbus_module
+    return True
+
+
+def load_daemon_modules() -> Optional[str]:
+    """Import the daemon-only modules; returns the missing package name, if any."""
+    global pympris, GLib, DBusGMainLoop
+    if not load_dbus():
+        return "dbus-python"
+    try:
+        import pympris as pympris_module
+    except ImportError:
+        return "pympris"
+    try:
+        from dbus.mainloop.glib import DBusGMainLoop as dbus_glib_main_loop
+        from gi.repository import GLib as glib_module
+    except ImportError:
+        return "PyGObject"
+    pympris, GLib, DBusGMainLoop = pympris_module, glib_module, dbus_glib_main_loop
+    return None
+
 
 CACHE_DIR = Path("/tmp/lyrics_cache")
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+# Single-file lyrics cache; set LYRICS_CACHE_PATH (or --cache-path) to keep it across reboots
+CACHE_DB_PATH = Path(os.environ.get("LYRICS_CACHE_PATH", CACHE_DIR / "lyrics.db"))
 
 DAEMON_OUTPUT_FILE = Path("/tmp/lyrics-daemon.json")
 DAEMON_PID_FILE = Path("/tmp/lyrics-daemon.pid")
+# Prometheus text dump, rewritten on SIGUSR1
+DAEMON_METRICS_FILE = Path("/tmp/lyrics-daemon.prom")
+# One-shot CLI calls are answered from the daemon's live state over this socket. It lives
+# in a directory only this user can write, so no one else can serve or squat on it.
+DAEMON_SOCKET_PATH = (
+    Path(os.environ.get("XDG_RUNTIME_DIR") or f"/tmp/lyrics-{os.getuid()}") / "lyrics-daemon.sock"
+)
+# Give up on the daemon quickly; the standalone path still works
+DAEMON_QUERY_TIMEOUT = 0.5
+
+OUTPUT_FORMATS = ["json", "waybar", "text", "raw"]
+# Formats that fit one line per record (newline-delimited JSON streams)
+STREAM_FORMATS = ["json", "waybar"]
 
 PLAYER_ORDER = ["brave", "spotify"]
 
+MPRIS_BUS_PREFIX = "org.mpris.MediaPlayer2."
+MPRIS_OBJECT_PATH = "/org/mpris/MediaPlayer2"
+MPRIS_PLAYER_INTERFACE = "org.mpris.MediaPlayer2.Player"
+DBUS_PROPERTIES_INTERFACE = "org.freedesktop.DBus.Properties"
+
 # Artist name mappings for search queries
 # Maps full artist names to preferred search names
 ARTIST_SEARCH_MAPPINGS = {
@@ -43,9 +97,260 @@ ARTIST_SEARCH_MAPPINGS = {
     # "Full Artist Name": "Preferred Search Name",
 }
 
+# Artist-specific title extraction, tried before any other cleaning.
+# A match returns the first group of `extract` with `remove` matches deleted.
+ARTIST_TITLE_RULES = [
+    # For ZUTOMAYO, extract content from 『』 and preserve inner brackets like 「」
+    # Also remove half-width parentheses () from the extracted title
+    {"artist": "ずっと真夜中でいいのに。 ZUTOMAYO", "extract": r"『([^』]+)』", "remove": r"\(.*?\)"},
+]
+
+# Optional JSON file extending the two tables above without editing code:
+# {"artist_search": {"Full Artist Name": "Search Name"},
+#  "artist_titles": [{"artist": "...", "extract": "regex with a group", "remove": "regex"}]}
+TITLE_RULES_PATH = Path(
+    os.environ.get(
+        "LYRICS_RULES_PATH", Path.home() / ".config" / "universal-lyrics" / "rules.json"
+    )
+)
+
+# Lyrics providers in preference order (exclude Megalobiz which often fails)
+LYRICS_PROVIDERS = ["Lrclib", "Musixmatch", "NetEase", "Genius"]
+
+# Per-provider deadline in seconds; late results are ignored
+PROVIDER_TIMEOUTS = {
+    "Lrclib": 5.0,
+    "Musixmatch": 6.0,
+    "NetEase": 6.0,
+    "Genius": 8.0,
+}
+
+
+# ============================================================================
+# Logging and Metrics
+# ============================================================================
+
+LOG_LEVELS = {"debug": 10, "info": 20, "error": 40}
+
+
+class Logger:
+    """
+    Leveled, rate-limited stderr logging in the "[LEVEL] message" format.
+    Messages take %-style args that are only formatted when the level is enabled,
+    so disabled debug calls cost one comparison. Each message template may log
+    BURST times per WINDOW seconds; the rest are counted and summarised later.
+    Give every call site its own template: a bare "%s" would share one window.
+    """
+
+    WINDOW = 60.0
+    BURST = 10
+
+    def __init__(self, level: str = "info"):
+        self.level = LOG_LEVELS.get(level, LOG_LEVELS["info"])
+        self.suppressed = 0
+        # template -> [window start, messages logged, messages suppressed]
+        self._windows: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def set_level(self, level: str) -> None:
+        self.level = LOG_LEVELS[level]
+
+    def debug(self, message: str, *args) -> bool:
+        return self.log(10, message, *args)
+
+    def info(
+        self, message: str, *args, tag: Optional[str] = None, limited: bool = True
+    ) -> bool:
+        return self.log(20, message, *args, tag=tag, limited=limited)
+
+    def error(self, message: str, *args) -> bool:
+        return self.log(40, message, *args)
+
+    def log(
+        self,
+        level: int,
+        message: str,
+        *args,
+        tag: Optional[str] = None,
+        limited: bool = True,
+    ) -> bool:
+        """
+        Write one message prefixed with `tag` (default: the level name).
+        False if its level is off or it was rate-limited; limited=False bypasses
+        the rate limit for explicitly requested output such as reports.
+        """
+        if level < self.level:
+            return False
+        name = tag or ("DEBUG" if level < 20 else "INFO" if level < 40 else "ERROR")
+        if limited and not self._admit(name, message):
+            return False
+        print(f"[{name}] {message % args if args else message}", file=sys.stderr)
+        return True
+
+    def _admit(self, name: str, message: str) -> bool:
+        """Count one `message` against its window; False once it is over BURST."""
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(message)
+            if window is None or now - window[0] >= self.WINDOW:
+                if window is not None and window[2]:
+                    print(
+                        f"[{name}] {window[2]} more {message!r} messages were suppressed",
+                        file=sys.stderr,
+                    )
+                window = self._windows[message] = [now, 0, 0]
+            window[1] += 1
+            if window[1] > self.BURST:
+                window[2] += 1
+                self.suppressed += 1
+                return False
+        return True
+
+
+LOG = Logger(os.environ.get("LYRICS_LOG_LEVEL", "info").lower())
+
+
+class Histogram:
+    """Fixed-bucket latency histogram in seconds (Prometheus-style buckets)."""
+
+    BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS) + 1)  # last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (capped at the maximum seen)."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.5) * 1000, 3),
+            "p95_ms": round(self.quantile(0.95) * 1000, 3),
+            "p99_ms": round(self.quantile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class Metrics:
+    """
+    Process-wide counters, gauges and histograms, keyed by name plus labels.
+    Thread-safe: fetch workers record into it as well as the main loop.
+    """
+
+    PREFIX = "lyrics_"
+
+    def __init__(self):
+        self.counters: dict[tuple, float] = {}
+        self.gauges: dict[tuple, float] = {}
+        self.histograms: dict[tuple, Histogram] = {}
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @staticmethod
+    def _series(name: str, labels: tuple) -> str:
+        if not labels:
+            return name
+        # Label values come from player identities; escape them for the text format
+        pairs = []
+        for key, value in labels:
+            value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+            pairs.append(f'{key}="{value}"')
+        return name + "{" + ",".join(pairs) + "}"
+
+    def snapshot(self) -> dict:
+        """JSON-friendly view: counters, gauges and histogram summaries in ms."""
+        with self._lock:
+            return {
+                "uptime_s": round(time.monotonic() - self.started, 1),
+                "counters": {self._series(n, l): v for (n, l), v in sorted(self.counters.items())},
+                "gauges": {self._series(n, l): v for (n, l), v in sorted(self.gauges.items())},
+                "histograms": {
+                    self._series(n, l): h.summary() for (n, l), h in sorted(self.histograms.items())
+                },
+            }
+
+    def format_prometheus(self) -> str:
+        """Prometheus text exposition format."""
+        out = []
+        with self._lock:
+            for kind, values in (("counter", self.counters), ("gauge", self.gauges)):
+                typed = set()
+                for (name, labels), value in sorted(values.items()):
+                    if name not in typed:
+                        out.append(f"# TYPE {self.PREFIX}{name} {kind}")
+                        typed.add(name)
+                    out.append(f"{self._series(self.PREFIX + name, labels)} {value:g}")
+            typed = set()
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                full = self.PREFIX + name
+                if name not in typed:
+                    out.append(f"# TYPE {full} histogram")
+                    typed.add(name)
+                cumulative = 0
+                for bound, count in zip(Histogram.BUCKETS + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    out.append(f"{self._series(full + '_bucket', labels + (('le', le),))} {cumulative}")
+                out.append(f"{self._series(full + '_sum', labels)} {histogram.sum:.6f}")
+                out.append(f"{self._series(full + '_count', labels)} {histogram.count}")
+        return "\n".join(out) + "\n"
+
+    def format_report(self) -> str:
+        """Multi-line human-readable summary for the log."""
+        snapshot = self.snapshot()
+        lines = [f"Metrics after {snapshot['uptime_s']:.0f}s:"]
+        for series, summary in snapshot["histograms"].items():
+            lines.append(
+                f"  {series}: n={summary['count']} mean={summary['mean_ms']}ms"
+                f" p95={summary['p95_ms']}ms max={summary['max_ms']}ms"
+            )
+        for series, value in {**snapshot["counters"], **snapshot["gauges"]}.items():
+            lines.append(f"  {series}: {value:g}")
+        return "\n".join(lines)
+
+
+METRICS = Metrics()
+
 
 def run_playerctl(player: str, *args) -> Optional[str]:
     """Run playerctl command and return output."""
+    import subprocess
+
     try:
         result = subprocess.run(
             ["playerctl", "-p", player, *args],
@@ -68,6 +373,8 @@ def find_active_player(
     target_player: Optional[str] = None,
 ) -> tuple[Optional[str], str]:
     """Find active player and return (player_name, status)."""
+    import subprocess
+
     try:
         all_players = (
             subprocess.run(
@@ -99,397 +406,1775 @@ def find_active_player(
     return None, "Stopped"
 
 
+def find_player_state_playerctl(
+    target_player: Optional[str] = None,
+) -> tuple[Optional[str], Optional[dict]]:
+    """Fallback one-shot path: detect the player and read its state via playerctl."""
+    player, status = find_active_player(target_player)
+    if not player or status not in ("Playing", "Paused"):
+        return None, None
+
+    position_str = run_playerctl(player, "position") or "0"
+    return player, {
+        "status": status,
+        "position": float(position_str),
+        "artist": run_playerctl(player, "metadata", "xesam:artist") or "",
+        "title": run_playerctl(player, "metadata", "xesam:title") or "",
+    }
+
+
+def find_player_state_dbus(
+    target_player: Optional[str] = None,
+) -> tuple[Optional[str], Optional[dict]]:
+    """
+    One-shot path: detect the player and read its state over the session bus.
+    One ListNames call plus one Properties.GetAll per candidate (usually one).
+    Returns (player_name, state) with playerctl-style names, e.g. "spotify".
+    """
+    load_dbus()
+    bus = dbus.SessionBus()
+    players = [
+        str(name)[len(MPRIS_BUS_PREFIX):]
+        for name in bus.list_names()
+        if name.startswith(MPRIS_BUS_PREFIX)
+    ]
+
+    if target_player:
+        # Search for specific player
+        candidates = [p for p in players if target_player.lower() in p.lower()]
+    else:
+        # Auto-detect using priority order
+        candidates = [
+            p for priority in PLAYER_ORDER for p in players if priority.lower() in p.lower()
+        ]
+
+    for player in candidates:
+        try:
+            properties = dbus.Interface(
+                bus.get_object(MPRIS_BUS_PREFIX + player, MPRIS_OBJECT_PATH, introspect=False),
+                DBUS_PROPERTIES_INTERFACE,
+            )
+            state = state_from_properties(
+                properties.GetAll(MPRIS_PLAYER_INTERFACE), time.monotonic()
+            )
+        except dbus.DBusException:
+            continue
+        if state["status"] in ("Playing", "Paused"):
+            return player, state
+
+    return None, None
+
+
+def find_player_state(
+    target_player: Optional[str] = None,
+) -> tuple[Optional[str], Optional[dict]]:
+    """Use direct DBus queries when available, playerctl otherwise."""
+    if load_dbus():
+        try:
+            return find_player_state_dbus(target_player)
+        except dbus.DBusException as e:
+            LOG.debug("DBus query failed, falling back to playerctl: %s", e)
+    return find_player_state_playerctl(target_player)
+
+
+@dataclass
+class TitleRules:
+    """Compiled artist rules: built-in tables plus the optional TITLE_RULES_PATH file."""
+
+    artist_search: dict[str, str]
+    # (artist substring, extract pattern, pattern removed from the extracted title)
+    artist_titles: list[tuple[str, re.Pattern, Optional[re.Pattern]]]
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "TitleRules":
+        artist_search = dict(ARTIST_SEARCH_MAPPINGS)
+        artist_titles = list(ARTIST_TITLE_RULES)
+        if path is not None and path.is_file():
+            try:
+                extra = json.loads(path.read_text())
+                file_search = dict(extra.get("artist_search", {}))
+                file_titles = extra.get("artist_titles", [])
+                if not isinstance(file_titles, list):
+                    raise TypeError("'artist_titles' must be a list")
+                artist_search.update(file_search)
+                # File rules take precedence over the built-in ones
+                artist_titles = file_titles + artist_titles
+            except (OSError, ValueError, AttributeError, TypeError) as e:
+                LOG.error("Ignoring title rules file %s: %s", path, e)
+
+        compiled = []
+        for rule in artist_titles:
+            try:
+                remove = rule.get("remove")
+                if not isinstance(rule["artist"], str):
+                    raise TypeError("'artist' must be a string")
+                extract = re.compile(rule["extract"])
+                if extract.groups < 1:
+                    # clean_title() returns group 1 of the match
+                    raise ValueError("'extract' needs a capture group")
+                compiled.append(
+                    (rule["artist"], extract, re.compile(remove) if remove else None)
+                )
+            except (KeyError, TypeError, ValueError, AttributeError, re.error) as e:
+                LOG.error("Ignoring title rule %r: %s", rule, e)
+        return cls(artist_search, compiled)
+
+
+_title_rules: Optional[TitleRules] = None
+
+
+def get_title_rules() -> TitleRules:
+    """Return the shared rules, loading TITLE_RULES_PATH on first use."""
+    global _title_rules
+    if _title_rules is None:
+        _title_rules = TitleRules.load(TITLE_RULES_PATH)
+    return _title_rules
+
+
+# Patterns used by clean_title(), compiled once
+FEAT_IN_BRACKETS_RE = re.compile(
+    r"[\(\[\【].*?(feat\.|ft\.|featuring).*?[\)\]\】]", re.IGNORECASE
+)
+FEAT_TAIL_RE = re.compile(r"(feat\.|ft\.|featuring).*", re.IGNORECASE)
+DOUBLE_BRACKET_RE = re.compile(r"^[^『]*『([^』]+)』.*")
+BRACKETED_RE = re.compile(r"[\(\[\【].*?[\)\]\】]")
+# Normalize various dashes/hyphens to standard hyphen-minus
+DASHES_TABLE = str.maketrans("–—−－", "----")
+# Separator characters become spaces, special quotes are dropped
+SEPARATORS_QUOTES_TABLE = str.maketrans("|/", "  ", "『』「」")
+# Emojis/symbols (U+1F000-U+1FFFF) and full-width forms (U+FF00-U+FFEF) in artist names
+ARTIST_NOISE_RE = re.compile("[\U0001F000-\U0001FFFF\uFF00-\uFFEF]")
+
+
 def clean_title(title: str, artist: str, player: str) -> tuple[str, str]:
     """
     Clean and extract title and artist from media title.
-    Returns (title, artist).
+    Returns (title, artist). Results are memoized; only "spotify" in `player` matters.
     """
+    return _clean_title(title, artist, "spotify" in player.lower())
+
+
+@lru_cache(maxsize=1024)
+def _clean_title(title: str, artist: str, spotify: bool) -> tuple[str, str]:
     extracted_artist = ""
-    original_title = title  # Keep original for comparison
 
-    # Special handling for specific artists
-    # For ZUTOMAYO, extract content from 『』 and preserve inner brackets like 「」
-    # Also remove half-width parentheses () from the extracted title
-    if "ずっと真夜中でいいのに。 ZUTOMAYO" in artist:
-        if "『" in title and "』" in title:
-            match = re.search(r"『([^』]+)』", title)
+    # Special handling for specific artists (ARTIST_TITLE_RULES)
+    for artist_part, extract, remove in get_title_rules().artist_titles:
+        if artist_part in artist:
+            match = extract.search(title)
             if match:
                 extracted_title = match.group(1)
-                # Remove half-width parentheses and their contents
-                extracted_title = re.sub(r"\(.*?\)", "", extracted_title).strip()
-                return extracted_title, extracted_artist
+                if remove is not None:
+                    extracted_title = remove.sub("", extracted_title)
+                return extracted_title.strip(), extracted_artist
 
     # For Spotify, only remove feat./ft. from title
-    if "spotify" in player.lower():
+    if spotify:
         # Remove feat./ft./featuring patterns (括弧内外両方)
-        title = re.sub(
-            r"[\(\[\【].*?(feat\.|ft\.|featuring).*?[\)\]\】]",
-            "",
-            title,
-            flags=re.IGNORECASE,
-        )
-        title = re.sub(r"(feat\.|ft\.|featuring).*", "", title, flags=re.IGNORECASE)
-        title = re.sub(r"\s+", " ", title).strip()
-        return title, extracted_artist
+        title = FEAT_IN_BRACKETS_RE.sub("", title)
+        title = FEAT_TAIL_RE.sub("", title)
+        return " ".join(title.split()), extracted_artist
 
-    # Normalize various dashes/hyphens to standard hyphen-minus
-    title = re.sub(r"[–—−－]", "-", title)
+    title = title.translate(DASHES_TABLE)
 
     # Extract from "Title / Artist" format (YouTube)
-    if " / " in title:
-        title = title.split(" / ")[0]
+    title = title.partition(" / ")[0]
 
     # Extract from 『』 brackets (Japanese format - high priority)
-    if "『" in title and "』" in title:
-        match = re.search(r"^[^『]*『([^』]+)』.*", title)
+    if "『" in title:
+        match = DOUBLE_BRACKET_RE.search(title)
         if match:
             title = match.group(1)
 
     # Truncate at " - " (often separates Artist or extra info)
-    if " - " in title:
-        title = title.split(" - ")[0]
+    title = title.partition(" - ")[0]
 
     # Remove all types of brackets and their contents ((), [], 【】)
     # These often contain translations, sub-titles, or metadata like [MV]
-    title = re.sub(r"[\(\[\【].*?[\)\]\】]", "", title)
-
-    # Replace separator characters with space
-    title = re.sub(r"[\|/]", " ", title)
+    title = BRACKETED_RE.sub("", title)
 
     # Remove feat./ft./featuring outside of brackets
-    title = re.sub(r"(feat\.|ft\.|featuring).*", "", title, flags=re.IGNORECASE)
+    title = FEAT_TAIL_RE.sub("", title)
 
-    # Remove special quotes
-    title = re.sub(r"[『』「」]", "", title)
+    # Separators to spaces, special quotes removed (after feat. so no new matches appear)
+    title = title.translate(SEPARATORS_QUOTES_TABLE)
 
     # Normalize consecutive spaces to single space
-    title = re.sub(r"\s+", " ", title).strip()
+    return " ".join(title.split()), extracted_artist
 
-    return title, extracted_artist
 
+def resolve_track(title: str, artist: str, player: str) -> tuple[str, str, str]:
+    """
+    Clean raw player metadata for lookup.
+    Returns (title, artist, cache_key); every cache user goes through this.
+    """
+    cleaned_title, extracted_artist = clean_title(title, artist, player)
+    artist = extracted_artist or artist
+    cache_key = hashlib.md5(f"{artist}{cleaned_title}".encode()).hexdigest()
+    return cleaned_title, artist, cache_key
 
-def get_lyrics(artist: str, title: str, cache_key: str) -> tuple[str, str]:
-    """Fetch lyrics using syncedlyrics and cache the result.
-    Returns (lyrics_content, cache_key_used)."""
-    # Ensure cache directory exists
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
-    cache_file = CACHE_DIR / f"{cache_key}.lrc"
-    metadata_file = CACHE_DIR / f"{cache_key}.meta"
+def format_artist(artist) -> str:
+    """Flatten xesam:artist, which can be a list."""
+    if isinstance(artist, list):
+        return ", ".join(artist) if artist else ""
+    return artist or ""
 
-    # Check if cache exists and metadata matches
-    if cache_file.exists():
-        lyrics_content = cache_file.read_text()
 
-        # Verify metadata if it exists
-        if metadata_file.exists():
-            try:
-                cached_meta = json.loads(metadata_file.read_text())
-                # Metadata includes title and artist for verification
-                if (
-                    cached_meta.get("title") == title
-                    and cached_meta.get("artist") == artist
-                ):
-                    return lyrics_content, cache_key
-                else:
-                    # Metadata mismatch - delete stale cache
-                    cache_file.unlink()
-                    metadata_file.unlink()
-            except (json.JSONDecodeError, KeyError):
-                # Corrupted metadata - delete cache
-                cache_file.unlink()
-                if metadata_file.exists():
-                    metadata_file.unlink()
-        else:
-            # Old cache without metadata - trust it for now
-            return lyrics_content, cache_key
+def state_from_properties(props: dict, timestamp: float) -> dict:
+    """
+    Build a playback state dict from org.mpris.MediaPlayer2.Player GetAll() output.
+    `timestamp` (time.monotonic()) is when the values were valid, used for position
+    interpolation; the monotonic clock keeps NTP steps and manual clock changes out of it.
+    """
+    metadata = props.get("Metadata", {})
+    return {
+        "status": str(props.get("PlaybackStatus", "Stopped")),
+        "position": int(props.get("Position", 0)) / 1_000_000.0,  # µs -> seconds
+        "rate": float(props.get("Rate", 1.0)),
+        "trackid": str(metadata.get("mpris:trackid", "")),
+        "title": str(metadata.get("xesam:title", "")),
+        # Handle xesam:artist which can be a list
+        "artist": format_artist(metadata.get("xesam:artist", "")),
+        "length_us": int(metadata.get("mpris:length", 0)),
+        "timestamp": timestamp,
+    }
 
-    # Search for lyrics
-    # Check if artist has a specific mapping
-    if artist and artist in ARTIST_SEARCH_MAPPINGS:
-        # Use mapped artist name directly without further processing
-        search_artist = ARTIST_SEARCH_MAPPINGS[artist]
-        search_query = f"{title} {search_artist}".strip()
-    else:
-        # Clean up artist name: remove emojis and full-width alphanumerics
-        clean_artist = artist
-        if artist:
-            # Remove emojis (U+1F000-U+1FFFF range and other common emoji ranges)
-            # Remove full-width alphanumerics (U+FF00-U+FFEF)
-            cleaned_chars = []
-            for char in artist:
-                code_point = ord(char)
-                # Skip emojis and full-width alphanumerics
-                if (0x1F000 <= code_point <= 0x1FFFF or  # Emojis and symbols
-                    0xFF00 <= code_point <= 0xFFEF):      # Full-width forms
-                    continue
-                cleaned_chars.append(char)
-            clean_artist = ''.join(cleaned_chars).strip()
 
-        # Use artist name in search if it's reasonably short
-        if clean_artist and len(clean_artist) < 30:
-            search_query = f"{title} {clean_artist}".strip()
-        else:
-            # Very long artist name or no artist - search by title only
-            search_query = title
+@dataclass
+class ProviderStats:
+    """Per-provider latency and hit-rate counters."""
 
-    # Log search query (only in daemon mode to avoid log spam)
-    if sys.argv and '--daemon' in sys.argv:
-        print(f"[Lyrics Search] Query: '{search_query}' (Title: '{title}', Artist: '{artist}')", flush=True)
+    requests: int = 0
+    synced_hits: int = 0
+    plain_hits: int = 0
+    misses: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    skipped: int = 0  # not called: an earlier request was still running past its deadline
+    total_latency: float = 0.0  # seconds, completed requests only
 
-    # Use reliable providers only (exclude Megalobiz which often fails)
-    lrc_content = syncedlyrics.search(
-        search_query, providers=["Lrclib", "Musixmatch", "NetEase", "Genius"]
-    )
+    @property
+    def hit_rate(self) -> float:
+        return (self.synced_hits + self.plain_hits) / self.requests if self.requests else 0.0
 
-    if lrc_content:
-        cache_file.write_text(lrc_content)
-        # Save metadata for verification
-        metadata = {"title": title, "artist": artist, "cache_key": cache_key}
-        metadata_file.write_text(json.dumps(metadata, ensure_ascii=False))
-        return lrc_content, cache_key
+    @property
+    def avg_latency(self) -> float:
+        completed = self.synced_hits + self.plain_hits + self.misses + self.errors
+        return self.total_latency / completed if completed else 0.0
 
-    # Create empty cache file if not found
-    cache_file.touch()
-    metadata = {"title": title, "artist": artist, "cache_key": cache_key}
-    metadata_file.write_text(json.dumps(metadata, ensure_ascii=False))
-    return "", cache_key
 
+LRC_LENGTH_TAG_RE = re.compile(r"^\[length:\s*(\d+:\d+(?:\.\d+)?)\s*\]", re.IGNORECASE | re.MULTILINE)
+LRC_TITLE_TAG_RE = re.compile(r"^\[ti:\s*(.*?)\s*\]", re.IGNORECASE | re.MULTILINE)
 
-def parse_timestamp(timestamp: str) -> float:
-    """Parse LRC timestamp [mm:ss.xx] to seconds."""
-    timestamp = timestamp.strip("[]")
-    parts = timestamp.split(":")
-    minutes = float(parts[0])
-    seconds = float(parts[1])
-    return minutes * 60 + seconds
+# Lyrics usually end this long (or less) before the track does: outro/fade-out
+MAX_OUTRO = 45.0
 
 
-def is_synced_lyrics(lyrics: str) -> bool:
-    """Check if lyrics contain timestamps."""
-    return bool(re.search(r"^\[\d+:\d+", lyrics, re.MULTILINE))
+def score_lyrics(lrc: str, duration: Optional[float], title: str = "") -> Optional[float]:
+    """
+    How well synced `lrc` fits the playing track, from 0 to 1.
+    Compares its [length:] tag (or last timestamp) with `duration`, blended with its
+    [ti:] tag against `title`. None when there is nothing to compare.
+    """
+    duration_score = None
+    if duration:
+        length_match = LRC_LENGTH_TAG_RE.search(lrc)
+        if length_match:
+            error = abs(parse_timestamp(length_match.group(1)) - duration)
+            duration_score = max(0.0, 1.0 - error / 10.0)
+        else:
+            times = LyricsTimeline.parse(lrc).times
+            if times:
+                gap = duration - times[-1]
+                if gap < -2.0:
+                    # Lyrics run past the end: a longer edit (live, extended, ...)
+                    duration_score = 0.0
+                elif gap <= MAX_OUTRO:
+                    duration_score = 1.0
+                else:
+                    # Lyrics end far too early: a shorter edit
+                    duration_score = max(0.0, 1.0 - (gap - MAX_OUTRO) / 120.0)
+
+    title_score = None
+    title_match = LRC_TITLE_TAG_RE.search(lrc) if title else None
+    if title_match:
+        title_score = similarity(
+            trigrams(normalize_for_match(title_match.group(1))),
+            trigrams(normalize_for_match(title)),
+        )
 
+    if duration_score is None:
+        return title_score
+    if title_score is None:
+        return duration_score
+    return 0.7 * duration_score + 0.3 * title_score
 
-def find_current_line(lyrics_lines: list[str], position: float) -> int:
-    """Find the current lyric line index based on playback position."""
-    current_idx = -1
 
-    for i, line in enumerate(lyrics_lines):
-        match = re.match(r"^\[(\d+:\d+\.\d+)\]", line)
-        if not match:
-            continue
+class LyricsFetcher:
+    """
+    Queries lyrics providers concurrently, each with its own deadline.
+    Without track info the first synced result wins. With a duration (or title), each
+    synced result is scored by score_lyrics(): a GOOD_MATCH returns at once, otherwise
+    the best result seen within RANK_GRACE of the first one wins. Plain lyrics are only
+    used once every provider has answered or timed out, in provider preference order.
+
+    Providers are called as provider(query, timeout) and must give up within `timeout`
+    seconds. A provider that still has a call running past its deadline gets no new
+    calls until that one returns, so a dead provider cannot pile up threads.
+    """
 
-        line_time = parse_timestamp(match.group(0))
+    DEFAULT_TIMEOUT = 8.0
+    GOOD_MATCH = 0.9
+    RANK_GRACE = 1.5  # seconds to wait for a better candidate after a poor one
+
+    def __init__(
+        self,
+        providers: dict[str, Callable[[str, float], Optional[str]]],
+        timeouts: Optional[dict[str, float]] = None,
+    ):
+        self.providers = providers
+        self.timeouts = timeouts or {}
+        self.stats = {name: ProviderStats() for name in providers}
+        # Calls not yet finished, per provider: future -> deadline (monotonic)
+        self._in_flight: dict[str, dict] = {name: {} for name in providers}
+        self._lock = threading.Lock()
+
+    def timeout_for(self, name: str) -> float:
+        return self.timeouts.get(name, self.DEFAULT_TIMEOUT)
+
+    def search(
+        self,
+        query: str,
+        duration: Optional[float] = None,
+        title: str = "",
+        on_better: Optional[Callable[[str, str, float], None]] = None,
+    ) -> Optional[tuple[str, str, Optional[float]]]:
+        """
+        Race all providers for `query` and return (lrc, provider_name, score), or None.
+        Providers still running when a scored result is returned keep going; if one
+        later beats it, on_better(lrc, provider_name, score) is called from its thread.
+        Raises TimeoutError when no provider answered at all (every one timed out,
+        failed or was still stuck), since that says nothing about the lyrics existing.
+        """
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        start = time.monotonic()
+        futures = {}
+        for name, provider in self.providers.items():
+            deadline = start + self.timeout_for(name)
+            with self._lock:
+                if any(due <= start for due in self._in_flight[name].values()):
+                    # Previous call overran its deadline: the provider is hung
+                    self.stats[name].skipped += 1
+                    future = None
+                else:
+                    self.stats[name].requests += 1
+                    future = self._start(provider, query, deadline)
+                    self._in_flight[name][future] = deadline
+            if future is None:
+                LOG.debug("Skipping %s: previous request still running", name)
+                METRICS.inc("provider_skipped_total", provider=name)
+                continue
+            future.add_done_callback(partial(self._record, name, start))
+            futures[future] = name
+
+        plain: dict[str, str] = {}
+        best: Optional[tuple[float, str, str]] = None  # (score, lrc, provider)
+        rank_deadline: Optional[float] = None
+        answered = False
+        pending = set(futures)
+        while pending:
+            elapsed = time.monotonic() - start
+            for future in [f for f in pending if elapsed >= self.timeout_for(futures[f])]:
+                pending.discard(future)
+                with self._lock:
+                    self.stats[futures[future]].timeouts += 1
+                METRICS.inc("provider_timeouts_total", provider=futures[future])
+            if not pending or (rank_deadline is not None and elapsed >= rank_deadline):
+                break
 
-        # Get next line time
-        next_time = 99999
-        if i + 1 < len(lyrics_lines):
-            next_match = re.match(r"^\[(\d+:\d+\.\d+)\]", lyrics_lines[i + 1])
-            if next_match:
-                next_time = parse_timestamp(next_match.group(0))
+            next_deadline = min(self.timeout_for(futures[f]) for f in pending) - elapsed
+            if rank_deadline is not None:
+                next_deadline = min(next_deadline, rank_deadline - elapsed)
+            done, pending = wait(pending, timeout=next_deadline, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    continue
+                answered = True
+                lrc = future.result()
+                if not lrc:
+                    continue
+                if not is_synced_lyrics(lrc):
+                    plain[futures[future]] = lrc
+                    continue
+                score = score_lyrics(lrc, duration, title)
+                if score is None:
+                    return lrc, futures[future], None
+                if best is None or score > best[0]:
+                    best = (score, lrc, futures[future])
+                if best[0] >= self.GOOD_MATCH:
+                    break
+                if rank_deadline is None:
+                    rank_deadline = time.monotonic() - start + self.RANK_GRACE
+            if best is not None and best[0] >= self.GOOD_MATCH:
+                break
 
-        # Check if position is in this line's time range
-        if line_time <= position < next_time:
-            current_idx = i
-            break
+        if best is not None:
+            score, lrc, name = best
+            if on_better is not None:
+                for future in pending:
+                    future.add_done_callback(
+                        partial(self._late_result, futures[future], score, duration, title, on_better)
+                    )
+            return lrc, name, score
 
-    return current_idx
+        for name in self.providers:
+            if name in plain:
+                return plain[name], name, None
+        if not answered:
+            raise TimeoutError(f"no lyrics provider answered for {query!r}")
+        return None
 
+    @staticmethod
+    def _start(provider: Callable[[str, float], Optional[str]], query: str, deadline: float):
+        """
+        Run one provider call on its own daemon thread and return its Future.
+        Daemon threads are not joined at exit, so a one-shot CLI run ends as soon as it
+        has printed instead of waiting for providers that lost the race.
+        """
+        from concurrent.futures import Future
 
-def strip_timestamp(line: str) -> str:
-    """Remove timestamp from lyric line."""
-    return re.sub(r"^\[[^\]]*\]\s*", "", line)
+        future = Future()
 
+        def run() -> None:
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(provider(query, deadline - time.monotonic()))
+            except BaseException as e:
+                future.set_exception(e)
 
-def output_json(lyrics_lines: list[str], position: float, is_synced: bool) -> str:
-    """Generate JSON output for Eww."""
-    if not lyrics_lines:
-        return json.dumps({"status": "no_lyrics", "lines": []})
+        threading.Thread(target=run, name="lyrics-provider", daemon=True).start()
+        return future
 
-    if is_synced:
-        current_idx = find_current_line(lyrics_lines, position)
-        if current_idx < 0:
-            current_idx = 0
+    @staticmethod
+    def _late_result(
+        name: str,
+        score_to_beat: float,
+        duration: Optional[float],
+        title: str,
+        on_better: Callable[[str, str, float], None],
+        future,
+    ) -> None:
+        """Done-callback for providers that answered after search() returned."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        lrc = future.result()
+        if not lrc or not is_synced_lyrics(lrc):
+            return
+        score = score_lyrics(lrc, duration, title)
+        if score is not None and score > score_to_beat:
+            on_better(lrc, name, score)
+
+    def _record(self, name: str, start: float, future) -> None:
+        """Done-callback: account latency and outcome for one provider request."""
+        latency = time.monotonic() - start
+        with self._lock:
+            self._in_flight[name].pop(future, None)
+            stats = self.stats[name]
+            if latency >= self.timeout_for(name):
+                # Counted as a timeout by search(); no completed-request latency
+                result = "timeout"
+            elif future.exception() is not None:
+                stats.errors += 1
+                result = "error"
+            elif not future.result():
+                stats.misses += 1
+                result = "miss"
+            elif is_synced_lyrics(future.result()):
+                stats.synced_hits += 1
+                result = "synced"
+            else:
+                stats.plain_hits += 1
+                result = "plain"
+            if result != "timeout":
+                stats.total_latency += latency
+        METRICS.observe("provider_fetch_seconds", latency, provider=name)
+        METRICS.inc("provider_requests_total", provider=name, result=result)
+
+    def format_stats(self) -> str:
+        """One-line summary for logs."""
+        with self._lock:
+            return ", ".join(
+                f"{name} {stats.hit_rate:.0%} hit/{stats.avg_latency:.2f}s avg"
+                f" ({stats.requests} req, {stats.timeouts} timeout, {stats.skipped} skipped)"
+                for name, stats in self.stats.items()
+            )
 
-        start = max(0, current_idx - 3)
-        end = min(len(lyrics_lines), current_idx + 4)
 
-        lines = []
-        for i in range(start, end):
-            text = strip_timestamp(lyrics_lines[i])
-            if text:
-                lines.append({"text": text, "current": i == current_idx})
+def _syncedlyrics_provider(name: str) -> Callable[[str, float], Optional[str]]:
+    """
+    Wrap a single syncedlyrics provider as a fetcher callable.
+    Each HTTP request the provider makes only gets what is left of `timeout`, so a
+    dead provider hands its worker thread back instead of holding it.
+    """
 
-        return json.dumps({"status": "ok", "lines": lines}, ensure_ascii=False)
-    else:
-        # Non-synced lyrics
-        lines = [{"text": line, "current": False} for line in lyrics_lines[:10] if line]
-        return json.dumps({"status": "ok", "lines": lines}, ensure_ascii=False)
+    def search(query: str, timeout: float) -> Optional[str]:
+        import syncedlyrics  # heavy (requests, bs4); only needed for network fetches
 
+        provider = getattr(syncedlyrics.providers, name)()
+        deadline = time.monotonic() + timeout
+        request = provider.session.request
 
-def output_waybar(lyrics_lines: list[str], position: float, is_synced: bool) -> str:
-    """Generate JSON output for Waybar."""
-    if not lyrics_lines:
-        return json.dumps({"text": "", "class": "hidden", "tooltip": "No lyrics found"})
+        def bounded_request(method, url, **kwargs):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"{name}: out of time before {method} {url}")
+            kwargs["timeout"] = remaining
+            return request(method, url, **kwargs)
 
-    tooltip_lines = []
-    current_lyric = ""
+        provider.session.request = bounded_request
+        lyrics = provider.get_lrc(query)
+        if lyrics is None or isinstance(lyrics, str):
+            return lyrics
+        # Same preference as syncedlyrics.search(): synced, else plain
+        return lyrics.synced or lyrics.unsynced
 
-    if is_synced:
-        current_idx = find_current_line(lyrics_lines, position)
+    return search
 
-        if current_idx >= 0:
-            start = max(0, current_idx - 2)
-            end = min(len(lyrics_lines), current_idx + 3)
 
-            for i in range(start, end):
-                lyric_text = strip_timestamp(lyrics_lines[i])
+_lyrics_fetcher: Optional[LyricsFetcher] = None
 
-                # Handle empty lines
-                if not lyric_text or lyric_text.isspace():
-                    if i == current_idx:
-                        lyric_text = "♪"
-                    else:
-                        continue
 
-                if i == current_idx:
-                    tooltip_lines.append(f"▶ {lyric_text}")
-                    current_lyric = lyric_text
-                else:
-                    tooltip_lines.append(f"  {lyric_text}")
-    else:
-        # Non-synced lyrics
-        tooltip_lines = lyrics_lines[:20]
-        if len(lyrics_lines) > 20:
-            tooltip_lines.append("... (以下省略)")
+def get_lyrics_fetcher() -> LyricsFetcher:
+    """Return the shared fetcher over LYRICS_PROVIDERS."""
+    global _lyrics_fetcher
+    if _lyrics_fetcher is None:
+        _lyrics_fetcher = LyricsFetcher(
+            {name: _syncedlyrics_provider(name) for name in LYRICS_PROVIDERS},
+            PROVIDER_TIMEOUTS,
+        )
+    return _lyrics_fetcher
 
-    tooltip = "\n".join(tooltip_lines) if tooltip_lines else "♪"
-    display_text = f"󰎆 {current_lyric}" if current_lyric else "󰎆"
 
-    return json.dumps(
-        {
-            "text": html.escape(display_text),
-            "class": "visible",
-            "tooltip": html.escape(tooltip),
-        },
-        ensure_ascii=False,
-    )
+# Channel/uploader noise that keeps one artist's uploads from matching each other
+ARTIST_MATCH_NOISE_RE = re.compile(
+    r"(\s*-\s*topic$|vevo$|official|youtube|channel|チャンネル|ちゃんねる)"
+)
+NON_WORD_RE = re.compile(r"[\W_]+")
+DIGITS_RE = re.compile(r"\d+")
+# Katakana -> hiragana so either spelling of a title matches
+KANA_FOLD_TABLE = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
 
 
-def output_text(
-    lyrics_lines: list[str],
-    position: float,
-    is_synced: bool,
-    title: str,
-    artist: str,
-    player: str,
-) -> str:
-    """Generate text output for CLI."""
-    output = [f"Now Playing: {title} - {artist} ({player})", "-" * 40]
+def normalize_for_match(text: str) -> str:
+    """Fold width (NFKC), case and kana and drop punctuation/spaces, for fuzzy matching."""
+    import unicodedata
 
-    if is_synced:
-        current_idx = find_current_line(lyrics_lines, position)
+    text = unicodedata.normalize("NFKC", text).casefold().translate(KANA_FOLD_TABLE)
+    return NON_WORD_RE.sub("", text)
 
-        for i, line in enumerate(lyrics_lines):
-            text = strip_timestamp(line)
-            if i == current_idx:
-                output.append(f"--> {text}")
-            else:
-                output.append(f"    {text}")
-    else:
-        output.extend(lyrics_lines)
 
-    return "\n".join(output)
+def normalize_artist_for_match(artist: str) -> str:
+    import unicodedata
 
+    artist = unicodedata.normalize("NFKC", artist).casefold()
+    return normalize_for_match(ARTIST_MATCH_NOISE_RE.sub("", artist))
 
-# ============================================================================
-# Daemon Components
-# ============================================================================
 
+def trigrams(normalized: str) -> set[str]:
+    """Character trigrams of a normalize_for_match() string, padded so short titles have some."""
+    padded = f"  {normalized} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
 
-@dataclass
-class PositionSnapshot:
-    """Captures a point-in-time position state."""
 
-    position: float  # seconds
-    timestamp: float  # time.time()
-    rate: float  # playback rate
-    status: str  # Playing/Paused/Stopped
+def similarity(a: set[str], b: set[str]) -> float:
+    """Jaccard similarity of two trigram sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
 
 
-class PositionInterpolator:
+def artists_match(a: str, b: str) -> bool:
+    """Compare normalize_artist_for_match() names; unknown artists only match each other."""
+    if not a or not b:
+        return a == b
+    return a in b or b in a or similarity(trigrams(a), trigrams(b)) >= 0.5
+
+
+@dataclass
+class CacheEntry:
+    """One cached lyrics lookup; an empty `lrc` records a "not found" result."""
+
+    key: str
+    title: Optional[str]  # None for legacy entries migrated without .meta
+    artist: Optional[str]
+    provider: Optional[str]
+    fetched_at: float  # time.time()
+    synced: bool
+    lrc: str
+    attempts: int = 0  # consecutive "not found" results
+    next_retry_at: Optional[float] = None  # negative entries only
+    duration: Optional[float] = None  # track length in seconds, when the player reported it
+    score: Optional[float] = None  # score_lyrics() of `lrc` for that track
+
+    @property
+    def is_negative(self) -> bool:
+        return not self.lrc
+
+
+class LyricsCacheStore:
     """
-    Interpolates playback position between MPRIS syncs.
-    Provides smooth updates while only querying MPRIS every 5 seconds.
+    SQLite-backed lyrics cache, one row per cache key.
+    Replaces the per-track .lrc/.meta pairs in CACHE_DIR (migrated once on open).
     """
 
-    SYNC_INTERVAL = 5.0  # seconds between MPRIS syncs
+    MAX_ENTRIES = 5000
+    MAX_BYTES = 64 * 1024 * 1024  # total LRC text
+    MAX_AGE = 180 * 24 * 3600.0  # entries are dropped after this
+    # "Not found" results are retried after 1h, 2h, 4h, ... capped at NEGATIVE_TTL
+    NEGATIVE_RETRY_BASE = 3600.0
+    NEGATIVE_TTL = 7 * 24 * 3600.0
+    EVICT_EVERY = 50  # run size/age eviction every N writes
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS lyrics (
+            key TEXT PRIMARY KEY,
+            title TEXT,
+            artist TEXT,
+            provider TEXT,
+            fetched_at REAL NOT NULL,
+            synced INTEGER NOT NULL,
+            lrc TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_retry_at REAL,
+            duration REAL,
+            score REAL
+        );
+        CREATE INDEX IF NOT EXISTS lyrics_fetched_at ON lyrics (fetched_at);
+        CREATE TABLE IF NOT EXISTS cache_meta (
+            name TEXT PRIMARY KEY,
+            value TEXT
+        );
+        -- Title trigram postings of positive entries, for fuzzy lookups
+        CREATE TABLE IF NOT EXISTS lyrics_trigrams (
+            trigram TEXT NOT NULL,
+            key TEXT NOT NULL,
+            PRIMARY KEY (trigram, key)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS lyrics_trigrams_key ON lyrics_trigrams (key);
+    """
 
-    def __init__(self):
-        self.last_snapshot: Optional[PositionSnapshot] = None
-        self.last_sync_time: float = 0.0
-        self.needs_sync = True
+    # Bump when normalize_for_match() changes so the trigram index is rebuilt
+    FUZZY_INDEX_VERSION = "1"
+    # Near-duplicates at or above this title similarity answer a lookup
+    FUZZY_THRESHOLD = 0.8
+    FUZZY_CANDIDATES = 20  # entries sharing the most trigrams that get scored
+    # Near-duplicates whose known track length differs more than this are other edits
+    FUZZY_MAX_DURATION_DIFF = 5.0
+
+    def __init__(self, path: Path, legacy_dir: Optional[Path] = CACHE_DIR):
+        self.path = path
+        import sqlite3  # ~5 ms; one-shot calls the daemon answers never open the store
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Shared by fetch worker threads; all access goes through self._lock
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._writes = 0
+        with self._lock, self._conn:
+            # WAL lets one-shot CLI calls read while the daemon writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+            self._upgrade_schema()
+            self._build_fuzzy_index()
+        if legacy_dir is not None:
+            self.migrate_legacy(legacy_dir)
+
+    COLUMNS = (
+        "key, title, artist, provider, fetched_at, synced, lrc, attempts, next_retry_at,"
+        " duration, score"
+    )
 
-    def update_from_mpris(self, state: dict) -> None:
-        """Update interpolator with fresh MPRIS data."""
-        self.last_snapshot = PositionSnapshot(
-            position=state["position"],
-            timestamp=time.time(),
-            rate=state["rate"],
-            status=state["status"],
+    def _upgrade_schema(self) -> None:
+        """Add columns missing from databases created by older versions."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(lyrics)")}
+        if "attempts" not in columns:
+            self._conn.execute("ALTER TABLE lyrics ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+        if "next_retry_at" not in columns:
+            self._conn.execute("ALTER TABLE lyrics ADD COLUMN next_retry_at REAL")
+            # Existing misses are retried on the original fixed TTL
+            self._conn.execute(
+                "UPDATE lyrics SET attempts = 1, next_retry_at = fetched_at + ? WHERE lrc = ''",
+                (self.NEGATIVE_RETRY_BASE,),
+            )
+        for column in ("duration", "score"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE lyrics ADD COLUMN {column} REAL")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS lyrics_next_retry_at ON lyrics (next_retry_at)"
         )
-        self.last_sync_time = time.time()
-        self.needs_sync = False
 
-    def should_sync(self) -> bool:
-        """Check if it's time to sync with MPRIS."""
-        if self.needs_sync:
-            return True
-        if self.last_snapshot is None:
-            return True
-        elapsed = time.time() - self.last_sync_time
-        return elapsed >= self.SYNC_INTERVAL
+    def _build_fuzzy_index(self) -> None:
+        """(Re)index all positive entries if the index is missing or outdated."""
+        row = self._conn.execute(
+            "SELECT value FROM cache_meta WHERE name = 'fuzzy_index_version'"
+        ).fetchone()
+        if row is not None and row[0] == self.FUZZY_INDEX_VERSION:
+            return
+        self._conn.execute("DELETE FROM lyrics_trigrams")
+        rows = self._conn.execute(
+            "SELECT key, title FROM lyrics WHERE lrc != '' AND title IS NOT NULL"
+        ).fetchall()
+        for key, title in rows:
+            self._index(key, title)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO cache_meta (name, value) VALUES ('fuzzy_index_version', ?)",
+            (self.FUZZY_INDEX_VERSION,),
+        )
 
-    def get_interpolated_position(self) -> float:
-        """Calculate current position using interpolation."""
-        if self.last_snapshot is None:
-            return 0.0
+    def _index(self, key: str, title: str) -> None:
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO lyrics_trigrams (trigram, key) VALUES (?, ?)",
+            [(gram, key) for gram in trigrams(normalize_for_match(title))],
+        )
 
-        # If paused or stopped, position doesn't change
-        if self.last_snapshot.status != "Playing":
-            return self.last_snapshot.position
+    @staticmethod
+    def _entry(row: tuple) -> CacheEntry:
+        return CacheEntry(
+            row[0], row[1], row[2], row[3], row[4], bool(row[5]), row[6], row[7], row[8],
+            row[9], row[10],
+        )
 
-        # Calculate elapsed time since snapshot
-        elapsed = time.time() - self.last_snapshot.timestamp
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self.COLUMNS} FROM lyrics WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return self._entry(row)
 
-        # Interpolate: position = last_position + (elapsed * rate)
-        interpolated = self.last_snapshot.position + (elapsed * self.last_snapshot.rate)
+    def lookup(self, key: str, title: str, artist: str) -> Optional[str]:
+        """
+        Return cached lyrics ("" for a fresh miss), or None if a fetch is needed.
+        Entries whose metadata does not match are deleted as stale.
+        """
+        entry = self.get(key)
+        if entry is None:
+            return None
+        # Entries migrated without metadata are trusted as before
+        if entry.title is not None and (entry.title != title or entry.artist != artist):
+            # Metadata mismatch - delete stale cache
+            self.delete(key)
+            return None
+        if not self.is_fresh(entry):
+            return None
+        return entry.lrc
 
-        return max(0.0, interpolated)
+    def find_similar(
+        self, title: str, artist: str, duration: Optional[float] = None
+    ) -> Optional[tuple[CacheEntry, float]]:
+        """
+        Best cached lyrics for a near-duplicate of (title, artist), e.g. the same song
+        from a YouTube channel and from Spotify. Returns (entry, similarity) or None.
+        When both lengths are known, entries for a different-length edit are skipped.
+        """
+        normalized = normalize_for_match(title)
+        wanted = trigrams(normalized)
+        # "Part 1" and "Part 2" are different songs however similar they look
+        wanted_numbers = DIGITS_RE.findall(normalized)
+        wanted_artist = normalize_artist_for_match(artist)
+        grams = list(wanted)
+        with self._lock:
+            candidates = self._conn.execute(
+                f"SELECT {', '.join('l.' + c for c in self.COLUMNS.split(', '))}"
+                " FROM (SELECT key, COUNT(*) AS shared FROM lyrics_trigrams"
+                f"       WHERE trigram IN ({', '.join('?' * len(grams))})"
+                "       GROUP BY key ORDER BY shared DESC LIMIT ?) AS t"
+                " JOIN lyrics AS l USING (key)"
+                " WHERE l.lrc != '' AND l.title IS NOT NULL",
+                (*grams, self.FUZZY_CANDIDATES),
+            ).fetchall()
+
+        best = None
+        for row in candidates:
+            entry = self._entry(row)
+            if not artists_match(wanted_artist, normalize_artist_for_match(entry.artist or "")):
+                continue
+            candidate = normalize_for_match(entry.title)
+            if DIGITS_RE.findall(candidate) != wanted_numbers:
+                continue
+            if (
+                duration
+                and entry.duration
+                and abs(entry.duration - duration) > self.FUZZY_MAX_DURATION_DIFF
+            ):
+                continue
+            score = similarity(wanted, trigrams(candidate))
+            if score >= self.FUZZY_THRESHOLD and (best is None or score > best[1]):
+                best = (entry, score)
+        return best
+
+    def expired_misses(self, limit: int = 1) -> list[CacheEntry]:
+        """Negative entries due for a retry, most overdue first."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self.COLUMNS} FROM lyrics"
+                " WHERE lrc = '' AND title IS NOT NULL AND next_retry_at <= ?"
+                " ORDER BY next_retry_at LIMIT ?",
+                (time.time(), limit),
+            ).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def put(
+        self,
+        key: str,
+        title: Optional[str],
+        artist: Optional[str],
+        lrc: str,
+        provider: Optional[str] = None,
+        fetched_at: Optional[float] = None,
+        duration: Optional[float] = None,
+        score: Optional[float] = None,
+    ) -> bool:
+        """
+        Store a lookup result. A scored result never replaces lyrics stored with a
+        higher score, so a late re-rank cannot be undone by the original write.
+        Returns False if the row was kept.
+        """
+        now = time.time()
+        if fetched_at is None:
+            fetched_at = now
+        with self._lock, self._conn:
+            if lrc and score is not None:
+                previous = self._conn.execute(
+                    "SELECT score FROM lyrics WHERE key = ? AND lrc != '' AND title IS ?",
+                    (key, title),
+                ).fetchone()
+                if previous and previous[0] is not None and previous[0] >= score:
+                    return False
+            attempts = 0
+            next_retry_at = None
+            if not lrc:
+                # Back off exponentially on repeated misses
+                previous = self._conn.execute(
+                    "SELECT attempts FROM lyrics WHERE key = ? AND lrc = ''", (key,)
+                ).fetchone()
+                attempts = (previous[0] if previous else 0) + 1
+                next_retry_at = fetched_at + min(
+                    self.NEGATIVE_RETRY_BASE * 2 ** (attempts - 1), self.NEGATIVE_TTL
+                )
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO lyrics ({self.COLUMNS})"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    title,
+                    artist,
+                    provider,
+                    fetched_at,
+                    is_synced_lyrics(lrc),
+                    lrc,
+                    attempts,
+                    next_retry_at,
+                    duration,
+                    score,
+                ),
+            )
+            self._conn.execute("DELETE FROM lyrics_trigrams WHERE key = ?", (key,))
+            if lrc and title:
+                self._index(key, title)
+            self._writes += 1
+            if self._writes % self.EVICT_EVERY == 0:
+                self._evict()
+        return True
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM lyrics WHERE key = ?", (key,))
+            self._conn.execute("DELETE FROM lyrics_trigrams WHERE key = ?", (key,))
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Positive entries stay valid; negative ones expire at their backoff deadline."""
+        if not entry.is_negative or entry.next_retry_at is None:
+            return True
+        return time.time() < entry.next_retry_at
+
+    def _evict(self) -> None:
+        """Drop entries past MAX_AGE, then the oldest ones over MAX_ENTRIES/MAX_BYTES."""
+        now = time.time()
+        self._conn.execute("DELETE FROM lyrics WHERE fetched_at < ?", (now - self.MAX_AGE,))
+        # Newest first: keep rows while both the count and running size fit
+        self._conn.execute(
+            """
+            DELETE FROM lyrics WHERE key IN (
+                SELECT key FROM (
+                    SELECT key,
+                           ROW_NUMBER() OVER (ORDER BY fetched_at DESC) AS n,
+                           SUM(LENGTH(lrc)) OVER (ORDER BY fetched_at DESC) AS size
+                    FROM lyrics
+                )
+                WHERE n > ? OR size > ?
+            )
+            """,
+            (self.MAX_ENTRIES, self.MAX_BYTES),
+        )
+        self._conn.execute(
+            "DELETE FROM lyrics_trigrams WHERE key NOT IN (SELECT key FROM lyrics)"
+        )
 
-    def handle_seek(self, new_position: float) -> None:
-        """Handle user seeking - force resync."""
-        if self.last_snapshot:
-            self.last_snapshot = PositionSnapshot(
-                position=new_position,
-                timestamp=time.time(),
-                rate=self.last_snapshot.rate,
-                status=self.last_snapshot.status,
+    def migrate_legacy(self, legacy_dir: Path) -> int:
+        """One-time import of <key>.lrc/<key>.meta pairs; migrated files are removed."""
+        with self._lock:
+            done = self._conn.execute(
+                "SELECT value FROM cache_meta WHERE name = 'legacy_migrated'"
+            ).fetchone()
+        if done or not legacy_dir.is_dir():
+            return 0
+
+        migrated = 0
+        for lrc_file in legacy_dir.glob("*.lrc"):
+            key = lrc_file.stem
+            meta_file = lrc_file.with_suffix(".meta")
+            title = artist = None
+            try:
+                lrc = lrc_file.read_text()
+                if meta_file.exists():
+                    meta = json.loads(meta_file.read_text())
+                    title, artist = meta.get("title"), meta.get("artist")
+                self.put(key, title, artist, lrc, fetched_at=lrc_file.stat().st_mtime)
+            except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+                # Corrupted entry - drop it, it will be fetched again
+                pass
+            lrc_file.unlink(missing_ok=True)
+            meta_file.unlink(missing_ok=True)
+            migrated += 1
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_meta (name, value) VALUES ('legacy_migrated', ?)",
+                (str(time.time()),),
             )
+        if migrated:
+            LOG.info("Migrated %d legacy cache files into %s", migrated, self.path)
+        return migrated
+
+
+_cache_store: Optional[LyricsCacheStore] = None
+
+
+def get_cache_store() -> LyricsCacheStore:
+    """Return the shared cache store at CACHE_DB_PATH."""
+    global _cache_store
+    if _cache_store is None:
+        _cache_store = LyricsCacheStore(CACHE_DB_PATH)
+    return _cache_store
+
+
+def build_search_query(title: str, artist: str) -> str:
+    """Provider query for a cleaned track: title plus a mapped or sanitised artist."""
+    # Check if artist has a specific mapping
+    artist_search = get_title_rules().artist_search
+    if artist and artist in artist_search:
+        # Use mapped artist name directly without further processing
+        return f"{title} {artist_search[artist]}".strip()
+
+    # Clean up artist name: remove emojis and full-width alphanumerics
+    clean_artist = ARTIST_NOISE_RE.sub("", artist).strip() if artist else artist
+
+    # Use artist name in search if it's reasonably short
+    if clean_artist and len(clean_artist) < 30:
+        return f"{title} {clean_artist}".strip()
+    # Very long artist name or no artist - search by title only
+    return title
+
+
+def get_lyrics(
+    artist: str,
+    title: str,
+    cache_key: str,
+    duration: Optional[float] = None,
+    on_update: Optional[Callable[[str], None]] = None,
+) -> tuple[str, str]:
+    """Fetch lyrics using syncedlyrics and cache the result.
+    `duration` (seconds) ranks candidates by how well they fit the track; if a
+    provider answers with a better fit after returning, the cache is updated and
+    on_update(lyrics_content) is called from a worker thread.
+    Returns (lyrics_content, cache_key_used). Raises TimeoutError when no provider
+    answered at all; nothing is cached then, so the caller decides when to retry."""
+    store = get_cache_store()
+
+    # Check if cache exists and metadata matches
+    cached = store.lookup(cache_key, title, artist)
+    if cached:
+        METRICS.inc("cache_lookups_total", result="hit")
+        return cached, cache_key
+
+    # The same song may be cached under another key (channel name, "- Topic", ...)
+    similar = store.find_similar(title, artist, duration)
+    if similar is not None:
+        entry, score = similar
+        LOG.debug(
+            "Fuzzy cache hit (%.2f): '%s - %s' -> '%s - %s'",
+            score, artist, title, entry.artist, entry.title,
+        )
+        METRICS.inc("cache_lookups_total", result="fuzzy")
+        # Alias it under this key so the next lookup is an exact hit
+        store.put(
+            cache_key, title, artist, entry.lrc, entry.provider,
+            duration=duration or entry.duration, score=entry.score,
+        )
+        return entry.lrc, cache_key
+    if cached is not None:
+        # Fresh "not found" result
+        METRICS.inc("cache_lookups_total", result="negative")
+        return cached, cache_key
+    METRICS.inc("cache_lookups_total", result="miss")
+
+    search_query = build_search_query(title, artist)
+
+    # Log search query (only in daemon mode to avoid log spam)
+    if sys.argv and "--daemon" in sys.argv:
+        LOG.info(
+            "Query: '%s' (Title: '%s', Artist: '%s')", search_query, title, artist,
+            tag="Lyrics Search",
+        )
+
+    def on_better(lrc_content: str, provider: str, score: float) -> None:
+        # A slower provider fits the track better: re-rank the cached entry
+        if not store.put(
+            cache_key, title, artist, lrc_content, provider, duration=duration, score=score
+        ):
+            return
+        LOG.debug("Re-ranked lyrics for '%s': %s (%.2f)", title, provider, score)
+        PARSED_LYRICS_CACHE.invalidate(cache_key)
+        if on_update:
+            on_update(lrc_content)
+
+    # Query all providers concurrently; the best-fitting synced result wins.
+    # TimeoutError (providers unreachable) propagates: it is not a "not found"
+    result = get_lyrics_fetcher().search(search_query, duration, title, on_better)
+
+    if result:
+        lrc_content, provider, score = result
+        if not store.put(
+            cache_key, title, artist, lrc_content, provider, duration=duration, score=score
+        ):
+            # A late, better candidate was stored first
+            lrc_content = store.get(cache_key).lrc
+        return lrc_content, cache_key
+
+    # Record "not found"; retried with exponential backoff
+    store.put(cache_key, title, artist, "")
+    return "", cache_key
+
+
+def parse_timestamp(timestamp: str) -> float:
+    """Parse LRC timestamp [mm:ss.xx] to seconds."""
+    timestamp = timestamp.strip("[]")
+    parts = timestamp.split(":")
+    minutes = float(parts[0])
+    seconds = float(parts[1])
+    return minutes * 60 + seconds
+
+
+# Leading run of time tags, e.g. "[00:12.00][01:30.00]" (also [mm:ss] / [mm:ss.xxx])
+LRC_TIME_TAGS_RE = re.compile(r"^(?:\[\d+:\d+(?:\.\d+)?\])+")
+LRC_TIME_TAG_RE = re.compile(r"\[(\d+:\d+(?:\.\d+)?)\]")
+# [offset:+/-ms] — positive values make lyrics appear earlier
+LRC_OFFSET_RE = re.compile(r"^\[offset:\s*([+-]?\d+)\s*\]", re.IGNORECASE | re.MULTILINE)
+# Enhanced LRC (A2 extension) inline word start, e.g. "[00:12.00]<00:12.00>Hello <00:12.40>world <00:13.10>"
+LRC_WORD_TAG_RE = re.compile(r"<(\d+:\d+(?:\.\d+)?)>")
+
+
+def split_word_tags(text: str) -> tuple[str, list[tuple[float, int]]]:
+    """
+    Strip enhanced-LRC word tags from a line's text.
+    Returns the clean text and (start time, character offset) per tag; a tag at
+    offset len(text) is the end of the last word.
+    """
+    parts = LRC_WORD_TAG_RE.split(text)
+    pieces = [parts[0]]
+    marks = []
+    length = len(parts[0])
+    for i in range(1, len(parts), 2):
+        marks.append((parse_timestamp(parts[i]), length))
+        pieces.append(parts[i + 1])
+        length += len(parts[i + 1])
+
+    joined = "".join(pieces)
+    clean = joined.strip()
+    lead = len(joined) - len(joined.lstrip())
+    words: list[tuple[float, int]] = []
+    for start, offset in marks:
+        offset = min(max(offset - lead, 0), len(clean))
+        if words and words[-1][1] == offset:
+            # Several tags before the same word: the last one is when it starts
+            words[-1] = (start, offset)
+        else:
+            words.append((start, offset))
+    return clean, words
+
+
+class LyricsTimeline:
+    """
+    Lyrics compiled once per track for cheap per-tick lookups.
+
+    Synced lyrics are stored as parallel arrays of start times (sorted) and
+    stripped texts; plain lyrics keep their lines in `texts` with no times.
+
+    Word timing from enhanced LRC is kept flat: `word_times` / `word_offsets`
+    hold every word's start time and character offset into its line's text,
+    and line i owns the slice line_words[i]:line_words[i + 1] (all three arrays
+    stay empty when no line has word tags).
+    """
+
+    __slots__ = ("times", "texts", "word_times", "word_offsets", "line_words", "_cursor")
+
+    def __init__(
+        self,
+        times: Optional[array] = None,
+        texts: tuple[str, ...] = (),
+        word_times: Optional[array] = None,
+        word_offsets: Optional[array] = None,
+        line_words: Optional[array] = None,
+    ):
+        self.times = times if times is not None else array("d")
+        self.texts = texts
+        self.word_times = word_times if word_times is not None else array("d")
+        self.word_offsets = word_offsets if word_offsets is not None else array("I")
+        self.line_words = line_words if line_words is not None else array("I")
+        self._cursor = -1
+
+    @classmethod
+    def parse(cls, content: str) -> "LyricsTimeline":
+        """Compile raw LRC (or plain) lyrics into a timeline."""
+        content = content.strip()
+        if not content:
+            return cls()
+
+        offset = 0.0
+        offset_match = LRC_OFFSET_RE.search(content)
+        if offset_match:
+            offset = int(offset_match.group(1)) / 1000.0
+
+        entries: list[tuple[float, str, Optional[list[tuple[float, int]]]]] = []
+        for line in content.split("\n"):
+            line = line.strip()
+            tags = LRC_TIME_TAGS_RE.match(line)
+            if not tags:
+                continue
+            text = line[tags.end():].strip()
+            stamps = [parse_timestamp(stamp) for stamp in LRC_TIME_TAG_RE.findall(tags.group(0))]
+
+            words = None
+            if "<" in text:
+                text, words = split_word_tags(text)
+                if words and words[0][1] > 0:
+                    # Text before the first word tag starts with the line
+                    words.insert(0, (stamps[0], 0))
+
+            for stamp in stamps:
+                start = max(0.0, stamp - offset)
+                line_words = None
+                if words:
+                    # Word tags are absolute; a repeated line ([00:10][01:20]) reuses
+                    # them shifted by its own start
+                    shift = stamp - stamps[0] - offset
+                    line_words = []
+                    previous = start
+                    for word_start, char_offset in words:
+                        previous = max(previous, word_start + shift)
+                        line_words.append((previous, char_offset))
+                entries.append((start, text, line_words))
+
+        if not entries:
+            # Plain (unsynced) lyrics
+            return cls(texts=tuple(content.split("\n")))
+
+        # Stable sort keeps file order for identical timestamps
+        entries.sort(key=lambda entry: entry[0])
+        timeline = cls(
+            times=array("d", (t for t, _, _ in entries)),
+            texts=tuple(text for _, text, _ in entries),
+        )
+        if any(words for _, _, words in entries):
+            line_words = array("I", [0])
+            for _, _, words in entries:
+                for word_start, char_offset in words or ():
+                    timeline.word_times.append(word_start)
+                    timeline.word_offsets.append(char_offset)
+                line_words.append(len(timeline.word_times))
+            timeline.line_words = line_words
+        return timeline
+
+    @property
+    def is_synced(self) -> bool:
+        return len(self.times) > 0
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate payload size, used for cache accounting."""
+        return (
+            self.times.itemsize * len(self.times)
+            + self.word_times.itemsize * len(self.word_times)
+            + self.word_offsets.itemsize * len(self.word_offsets)
+            + self.line_words.itemsize * len(self.line_words)
+            + sum(len(t.encode()) for t in self.texts)
+        )
+
+    def index_at(self, position: float) -> int:
+        """
+        Return the index of the line active at `position`, or -1 before the first line.
+        During normal playback the cursor advances one step; seeks fall back to bisect.
+        """
+        times = self.times
+        if not times:
+            return -1
+
+        cursor = self._cursor
+        if 0 <= cursor < len(times) and times[cursor] <= position:
+            if cursor + 1 == len(times) or position < times[cursor + 1]:
+                return cursor
+            if cursor + 2 == len(times) or position < times[cursor + 2]:
+                self._cursor = cursor + 1
+                return cursor + 1
+
+        self._cursor = bisect_right(times, position) - 1
+        return self._cursor
+
+    def _word_span(self, index: int) -> tuple[int, int, Optional[float]]:
+        """
+        Slice of the word arrays holding line `index`'s words, excluding a trailing
+        end tag, and the line's end time (end tag, else next line start, else None).
+        """
+        lo = hi = 0
+        end = self.times[index + 1] if index + 1 < len(self.times) else None
+        if self.line_words:
+            lo, hi = self.line_words[index], self.line_words[index + 1]
+            if hi > lo and self.word_offsets[hi - 1] >= len(self.texts[index]):
+                hi -= 1
+                end = self.word_times[hi]
+        return lo, hi, end
+
+    def line_end(self, index: int) -> Optional[float]:
+        """End of line `index`: its end tag, else the next line's start (None for the last)."""
+        return self._word_span(index)[2]
+
+    def words(self, index: int) -> list[tuple[str, float]]:
+        """
+        Line `index`'s words as (text, start time), split at its word tags so the
+        texts join back to the line; [] when the line has no word timing.
+        """
+        lo, hi, _ = self._word_span(index)
+        text = self.texts[index]
+        offsets = self.word_offsets
+        return [
+            (text[offsets[i]:offsets[i + 1] if i + 1 < hi else len(text)], self.word_times[i])
+            for i in range(lo, hi)
+        ]
+
+    def progress_at(self, index: int, position: float) -> tuple[Optional[float], int]:
+        """
+        Karaoke state of line `index` at `position`: the fraction of the line
+        elapsed (None for a final line with no end tag) and the index of the word
+        being sung (-1 before the first word or when the line has no word timing).
+        """
+        lo, hi, end = self._word_span(index)
+        word = bisect_right(self.word_times, position, lo, hi) - 1 - lo if hi > lo else -1
+        if end is None:
+            return None, word
+        start = self.times[index]
+        if end <= start:
+            return 1.0, word
+        return min(max((position - start) / (end - start), 0.0), 1.0), word
+
+    def next_boundary(self, position: float) -> Optional[float]:
+        """Return the start time of the line after the one active at `position`."""
+        next_idx = self.index_at(position) + 1
+        if next_idx < len(self.times):
+            return self.times[next_idx]
+        return None
+
+
+def is_synced_lyrics(lyrics: str) -> bool:
+    """Check if lyrics contain timestamps."""
+    return bool(re.search(r"^\[\d+:\d+", lyrics, re.MULTILINE))
+
+
+def find_current_line(timeline: LyricsTimeline, position: float) -> int:
+    """Find the current lyric line index based on playback position."""
+    return timeline.index_at(position)
+
+
+def build_line_timing(
+    timeline: LyricsTimeline, index: int, position: float, progress: bool = False
+) -> dict:
+    """
+    Karaoke fields for the current line: "start"/"end" in track seconds ("end" is
+    left out on a last line without an end tag) and, for enhanced LRC, "words"
+    with their "word_starts". They stay the same while the line is current, so the
+    daemon's output still only changes per line; widgets interpolate from there.
+    With `progress`, also the moment's "progress" (0-1 through the line) and "word"
+    (index being sung, -1 before the first), for one-off replies.
+    """
+    fields = {"start": round(timeline.times[index], 3)}
+    end = timeline.line_end(index)
+    if end is not None:
+        fields["end"] = round(end, 3)
+    words = timeline.words(index)
+    if words:
+        fields["words"] = [text for text, _ in words]
+        fields["word_starts"] = [round(start, 3) for _, start in words]
+    if progress:
+        fraction, word = timeline.progress_at(index, position)
+        if fraction is not None:
+            fields["progress"] = round(fraction, 3)
+        if words:
+            fields["word"] = word
+    return fields
+
+
+def build_json_output(timeline: LyricsTimeline, position: float, progress: bool = False) -> dict:
+    """
+    Build the Eww JSON payload as a dict (shared by CLI and daemon).
+    `progress` adds the position-dependent fields of build_line_timing(); the daemon's
+    file and streams leave them out so the payload only changes when the line does.
+    """
+    if not timeline:
+        return {"status": "no_lyrics", "lines": []}
+
+    texts = timeline.texts
+    if timeline.is_synced:
+        current_idx = timeline.index_at(position)
+        if current_idx < 0:
+            current_idx = 0
+
+        start = max(0, current_idx - 3)
+        end = min(len(texts), current_idx + 4)
+
+        lines = []
+        for i in range(start, end):
+            text = texts[i]
+            if text:
+                lines.append({"text": text, "current": i == current_idx})
+                if i == current_idx:
+                    lines[-1].update(build_line_timing(timeline, i, position, progress))
+
+        return {"status": "ok", "lines": lines}
+    else:
+        # Non-synced lyrics
+        lines = [{"text": line, "current": False} for line in texts[:10] if line]
+        return {"status": "ok", "lines": lines}
+
+
+def output_json(timeline: LyricsTimeline, position: float, progress: bool = False) -> str:
+    """Generate JSON output for Eww."""
+    return json.dumps(build_json_output(timeline, position, progress), ensure_ascii=False)
+
+
+def output_waybar(timeline: LyricsTimeline, position: float, progress: bool = False) -> str:
+    """Generate JSON output for Waybar; `progress` adds the line's "percentage"."""
+    if not timeline:
+        return json.dumps({"text": "", "class": "hidden", "tooltip": "No lyrics found"})
+
+    texts = timeline.texts
+    tooltip_lines = []
+    current_lyric = ""
+    percentage = None
+
+    if timeline.is_synced:
+        current_idx = timeline.index_at(position)
+
+        if current_idx >= 0:
+            start = max(0, current_idx - 2)
+            end = min(len(texts), current_idx + 3)
+
+            for i in range(start, end):
+                lyric_text = texts[i]
+
+                # Handle empty lines
+                if not lyric_text or lyric_text.isspace():
+                    if i == current_idx:
+                        lyric_text = "♪"
+                    else:
+                        continue
+
+                if i == current_idx:
+                    tooltip_lines.append(f"▶ {lyric_text}")
+                    current_lyric = lyric_text
+                    if progress:
+                        fraction, _ = timeline.progress_at(i, position)
+                        if fraction is not None:
+                            percentage = int(fraction * 100)
+                else:
+                    tooltip_lines.append(f"  {lyric_text}")
+    else:
+        # Non-synced lyrics
+        tooltip_lines = list(texts[:20])
+        if len(texts) > 20:
+            tooltip_lines.append("... (以下省略)")
+
+    tooltip = "\n".join(tooltip_lines) if tooltip_lines else "♪"
+    display_text = f"󰎆 {current_lyric}" if current_lyric else "󰎆"
+
+    payload = {
+        "text": html.escape(display_text),
+        "class": "visible",
+        "tooltip": html.escape(tooltip),
+    }
+    if percentage is not None:
+        # Waybar's own field: usable by format-icons and {percentage}
+        payload["percentage"] = percentage
+    return json.dumps(payload, ensure_ascii=False)
+
+
+def output_text(
+    timeline: LyricsTimeline,
+    position: float,
+    title: str,
+    artist: str,
+    player: str,
+) -> str:
+    """Generate text output for CLI."""
+    output = [f"Now Playing: {title} - {artist} ({player})", "-" * 40]
+
+    if timeline.is_synced:
+        current_idx = timeline.index_at(position)
+
+        for i, text in enumerate(timeline.texts):
+            if i == current_idx:
+                output.append(f"--> {text}")
+            else:
+                output.append(f"    {text}")
+    else:
+        output.extend(timeline.texts)
+
+    return "\n".join(output)
+
+
+# Placeholder output when there are no lyrics to show: status -> (waybar tooltip, text)
+STATUS_MESSAGES = {
+    "stopped": ("No active player", "No active player found."),
+    "no_info": ("No track info", "No track info available."),
+    "no_lyrics": ("No lyrics found", "Lyrics not found for: {artist} - {title}"),
+    "loading": ("Loading lyrics...", "Loading lyrics for: {artist} - {title}"),
+}
+
+
+def render_status(fmt: str, status: str, title: str = "", artist: str = "") -> str:
+    """Render a lyrics-less state (see STATUS_MESSAGES) in the requested format."""
+    tooltip, text = STATUS_MESSAGES[status]
+    if fmt == "json":
+        return json.dumps({"status": status, "lines": []})
+    if fmt == "waybar":
+        return json.dumps({"text": "", "class": "hidden", "tooltip": tooltip})
+    return text.format(title=title, artist=artist)
+
+
+def render_lyrics(
+    fmt: str,
+    lyrics_content: str,
+    timeline: LyricsTimeline,
+    position: float,
+    title: str,
+    artist: str,
+    player: str,
+    progress: bool = False,
+) -> str:
+    """
+    Render found lyrics in the requested format (shared by CLI and daemon socket).
+    `progress` adds where in the current line `position` is (one-off replies only).
+    """
+    if fmt == "raw":
+        return lyrics_content
+    if fmt == "waybar":
+        return output_waybar(timeline, position, progress)
+    if fmt == "text":
+        return output_text(timeline, position, title, artist, player)
+    return output_json(timeline, position, progress)
+
+
+class LyricsLRUCache:
+    """
+    Bounded in-memory LRU of parsed lyrics, keyed by the md5 cache key.
+    Sits in front of the SQLite cache so repeated tracks skip disk reads and re-parsing.
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 4 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[str, LyricsTimeline, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[tuple[str, LyricsTimeline]]:
+        """Return (lyrics_content, timeline) and mark the entry as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def put(self, key: str, lyrics_content: str, timeline: LyricsTimeline) -> None:
+        """Insert or replace an entry, evicting least recently used ones over budget."""
+        size = len(lyrics_content.encode()) + timeline.nbytes
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[2]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (lyrics_content, timeline, size)
+            self.total_bytes += size
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[2]
+
+    def format_stats(self) -> str:
+        """One-line summary for logs."""
+        return (
+            f"{self.hits} hits, {self.misses} misses, {self.evictions} evictions"
+            f" ({len(self._entries)} entries, {self.total_bytes} bytes)"
+        )
+
+
+# Shared by every TrackStateManager in the daemon process
+PARSED_LYRICS_CACHE = LyricsLRUCache()
+
+
+# ============================================================================
+# Daemon Components
+# ============================================================================
+
+
+@dataclass
+class PositionSnapshot:
+    """Captures a point-in-time position state."""
+
+    position: float  # seconds
+    timestamp: float  # time.monotonic()
+    rate: float  # playback rate
+    status: str  # Playing/Paused/Stopped
+    trackid: str = ""
+
+
+class SyncPolicy:
+    """
+    Adaptive resync interval for one player identity (e.g. "Spotify"), learned from
+    drift: how far the reported position is from the interpolated one at each sync.
+    The interval is sized so the expected drift stays under DRIFT_TOLERANCE.
+    """
+
+    INITIAL_INTERVAL = 5.0
+    MIN_INTERVAL = 1.0
+    MAX_INTERVAL = 30.0
+    DRIFT_TOLERANCE = 0.025  # seconds of error we accept before resyncing
+    # Larger differences are unsignalled seeks or track restarts, not drift
+    JUMP_THRESHOLD = 1.0
+    MIN_SAMPLE_SPAN = 0.5  # shorter gaps between syncs give noisy drift rates
+    SMOOTHING = 0.3  # EWMA weight of the newest drift rate
+
+    def __init__(self, identity: str):
+        self.identity = identity
+        self.interval = self.INITIAL_INTERVAL
+        self.drift_rate: Optional[float] = None  # EWMA of |drift| per second interpolated
+        self.samples = 0
+        self.total_abs_drift = 0.0
+        self.max_abs_drift = 0.0
+        self.last_drift = 0.0
+        self.jumps = 0
+        self.rate_changes = 0
+
+    def record(self, drift: float, elapsed: float) -> None:
+        """Learn from one sync: `drift` seconds of error after `elapsed` seconds of interpolation."""
+        if abs(drift) > self.JUMP_THRESHOLD:
+            self.jumps += 1
+            return
+        if elapsed < self.MIN_SAMPLE_SPAN:
+            return
+        self.samples += 1
+        self.last_drift = drift
+        self.total_abs_drift += abs(drift)
+        self.max_abs_drift = max(self.max_abs_drift, abs(drift))
+        METRICS.observe("sync_drift_seconds", abs(drift), player=self.identity)
+
+        rate = abs(drift) / elapsed
+        if self.drift_rate is None:
+            self.drift_rate = rate
+        else:
+            self.drift_rate += self.SMOOTHING * (rate - self.drift_rate)
+        if self.drift_rate <= 0:
+            self.interval = self.MAX_INTERVAL
+        else:
+            self.interval = min(
+                self.MAX_INTERVAL, max(self.MIN_INTERVAL, self.DRIFT_TOLERANCE / self.drift_rate)
+            )
+
+    def rate_changed(self) -> None:
+        """Playback rate changed: what we learned no longer applies, so resync often."""
+        self.rate_changes += 1
+        self.drift_rate = None
+        self.interval = self.MIN_INTERVAL
+
+    def to_dict(self) -> dict:
+        return {
+            "player": self.identity,
+            "sync_interval_s": round(self.interval, 2),
+            "samples": self.samples,
+            "mean_abs_drift_ms": (
+                round(self.total_abs_drift / self.samples * 1000, 2) if self.samples else None
+            ),
+            "max_abs_drift_ms": round(self.max_abs_drift * 1000, 2),
+            "last_drift_ms": round(self.last_drift * 1000, 2),
+            "drift_rate_ms_per_s": (
+                round(self.drift_rate * 1000, 3) if self.drift_rate is not None else None
+            ),
+            "jumps": self.jumps,
+            "rate_changes": self.rate_changes,
+        }
+
+
+class PositionInterpolator:
+    """
+    Interpolates playback position between MPRIS syncs.
+    Provides smooth updates while only querying MPRIS every `sync_interval` seconds,
+    which the player's SyncPolicy adapts to the drift it measures.
+    """
+
+    def __init__(self, policy: Optional[SyncPolicy] = None):
+        self.last_snapshot: Optional[PositionSnapshot] = None
+        self.last_sync_time: float = 0.0
         self.needs_sync = True
+        self.policy = policy or SyncPolicy("")
+
+    @property
+    def sync_interval(self) -> float:
+        """Seconds between periodic MPRIS syncs."""
+        return self.policy.interval
+
+    def update_from_mpris(self, state: dict) -> None:
+        """Update interpolator with fresh MPRIS data, measuring drift against the last snapshot."""
+        timestamp = state.get("timestamp", time.monotonic())
+        previous = self.last_snapshot
+        trackid = state.get("trackid", "")
+        if previous is not None and previous.status == "Playing" and state["status"] == "Playing":
+            if state["rate"] != previous.rate:
+                self.policy.rate_changed()
+            elif trackid == previous.trackid:
+                predicted = previous.position + (timestamp - previous.timestamp) * previous.rate
+                self.policy.record(state["position"] - predicted, timestamp - previous.timestamp)
+        self.last_snapshot = PositionSnapshot(
+            position=state["position"],
+            timestamp=timestamp,
+            rate=state["rate"],
+            status=state["status"],
+            trackid=trackid,
+        )
+        self.last_sync_time = timestamp
+        self.needs_sync = False
+
+    def should_sync(self) -> bool:
+        """Check if it's time to sync with MPRIS."""
+        if self.needs_sync:
+            return True
+        if self.last_snapshot is None:
+            return True
+        elapsed = time.monotonic() - self.last_sync_time
+        return elapsed >= self.sync_interval
+
+    def get_interpolated_position(self) -> float:
+        """Calculate current position using interpolation."""
+        if self.last_snapshot is None:
+            return 0.0
+
+        # If paused or stopped, position doesn't change
+        if self.last_snapshot.status != "Playing":
+            return self.last_snapshot.position
+
+        # Calculate elapsed time since snapshot
+        elapsed = time.monotonic() - self.last_snapshot.timestamp
+
+        # Interpolate: position = last_position + (elapsed * rate)
+        interpolated = self.last_snapshot.position + (elapsed * self.last_snapshot.rate)
+
+        return max(0.0, interpolated)
+
+    def handle_seek(self, new_position: float) -> None:
+        """Handle a Seeked signal - the reported position is authoritative."""
+        if self.last_snapshot is None:
+            self.needs_sync = True
+            return
+
+        now = time.monotonic()
+        self.last_snapshot = PositionSnapshot(
+            position=new_position,
+            timestamp=now,
+            rate=self.last_snapshot.rate,
+            status=self.last_snapshot.status,
+            trackid=self.last_snapshot.trackid,
+        )
+        self.last_sync_time = now
 
 
 class TrackStateManager:
-    """Handles track changes and lyrics caching."""
+    """
+    Handles track changes and lyrics caching.
+    Lyrics are fetched on worker threads so the daemon loop never blocks on providers.
+    """
 
-    def __init__(self, cache_dir: Path):
-        self.cache_dir = cache_dir
+    FETCH_WORKERS = 2
+    # Seconds before re-fetching lyrics for the current track when no provider answered
+    UNREACHABLE_RETRY = 60.0
+
+    def __init__(
+        self,
+        on_lyrics_ready: Optional[Callable[[], None]] = None,
+        executor=None,
+    ):
         self.current_trackid: Optional[str] = None
         self.current_title: Optional[str] = None
         self.current_artist: Optional[str] = None
+        self.current_cache_key: Optional[str] = None
+        # Cleaned title/artist used for the lookup (what one-shot text output shows)
+        self.resolved_title = ""
+        self.resolved_artist = ""
         self.lyrics_content: str = ""
-        self.lyrics_lines: list[str] = []
-        self.is_synced: bool = False
+        self.timeline = LyricsTimeline()
+        self.loading = False
+        # Bumped on every track change; fetch results from older generations are dropped
+        self.generation = 0
+        # Called from the worker thread once lyrics for the current track are in place
+        self.on_lyrics_ready = on_lyrics_ready
+        self._lock = threading.Lock()
+        if executor is None:
+            # The daemon shares one pool across all player sessions
+            from concurrent.futures import ThreadPoolExecutor
+
+            executor = ThreadPoolExecutor(
+                max_workers=self.FETCH_WORKERS, thread_name_prefix="lyrics-fetch"
+            )
+        self._executor = executor
 
     def check_track_change(self, state: dict) -> bool:
         """
@@ -510,265 +2195,1280 @@ class TrackStateManager:
 
         return False
 
-    def update_track(self, state: dict, player_name: str) -> None:
-        """Update to new track and fetch lyrics."""
-        self.current_trackid = state["trackid"]
-        self.current_title = state["title"]
-        self.current_artist = state["artist"]
+    def update_track(self, state: dict, player_name: str) -> None:
+        """Update to new track and fetch lyrics."""
+        self.current_trackid = state["trackid"]
+        self.current_title = state["title"]
+        self.current_artist = state["artist"]
+
+        # Clean title and generate cache key (unified with non-daemon mode)
+        title, artist, cache_key = resolve_track(state["title"], state["artist"], player_name)
+
+        with self._lock:
+            self.generation += 1
+            generation = self.generation
+            self.current_cache_key = cache_key
+            self.resolved_title = title
+            self.resolved_artist = artist
+            self.lyrics_content = ""
+            self.timeline = LyricsTimeline()
+            self.loading = True
+
+        # Fetch lyrics in the background (uses cache if available)
+        duration = state.get("length_us", 0) / 1_000_000.0 or None
+        self._executor.submit(self._fetch, generation, artist, title, cache_key, duration)
+
+    def _fetch(
+        self,
+        generation: int,
+        artist: str,
+        title: str,
+        cache_key: str,
+        duration: Optional[float] = None,
+    ) -> None:
+        """Worker: fetch and compile lyrics, dropping results for superseded tracks."""
+        if generation != self.generation:
+            # Skipped past this track before the fetch even started
+            return
+
+        cached = PARSED_LYRICS_CACHE.get(cache_key)
+        if cached is not None:
+            lyrics_content, timeline = cached
+        else:
+            try:
+                lyrics_content, _ = get_lyrics(
+                    artist, title, cache_key, duration,
+                    on_update=partial(self._set_lyrics, generation, cache_key),
+                )
+                # Compile lyrics once; output uses the timeline on every tick
+                timeline = LyricsTimeline.parse(lyrics_content)
+                # Misses stay out so the store's retry schedule applies
+                if lyrics_content:
+                    PARSED_LYRICS_CACHE.put(cache_key, lyrics_content, timeline)
+            except TimeoutError as e:
+                # Offline: nothing was cached, so try again while this track is current
+                LOG.info("Lyrics fetch failed: %s", e)
+                lyrics_content, timeline = "", LyricsTimeline()
+                self._schedule_retry(generation, artist, title, cache_key, duration)
+            except Exception as e:
+                LOG.error("Lyrics fetch failed: %s", e)
+                lyrics_content, timeline = "", LyricsTimeline()
+
+        self._apply(generation, lyrics_content, timeline)
+
+    def _schedule_retry(self, generation: int, *args) -> None:
+        """Re-run _fetch() after UNREACHABLE_RETRY unless the track changed meanwhile."""
+
+        def retry():
+            if generation != self.generation:
+                return
+            try:
+                self._executor.submit(self._fetch, generation, *args)
+            except RuntimeError:
+                pass  # executor shut down
+
+        timer = threading.Timer(self.UNREACHABLE_RETRY, retry)
+        timer.daemon = True
+        timer.start()
+
+    def _set_lyrics(self, generation: int, cache_key: str, lyrics_content: str) -> None:
+        """get_lyrics() on_update hook: swap in a better-ranked result that came in late."""
+        timeline = LyricsTimeline.parse(lyrics_content)
+        PARSED_LYRICS_CACHE.put(cache_key, lyrics_content, timeline)
+        self._apply(generation, lyrics_content, timeline)
+
+    def _apply(self, generation: int, lyrics_content: str, timeline: LyricsTimeline) -> None:
+        with self._lock:
+            if generation != self.generation:
+                return
+            self.lyrics_content = lyrics_content
+            self.timeline = timeline
+            self.loading = False
+
+        if self.on_lyrics_ready:
+            self.on_lyrics_ready()
+
+    def snapshot(self) -> tuple[bool, str, LyricsTimeline]:
+        """(loading, lyrics_content, timeline) for the current track, read consistently."""
+        with self._lock:
+            return self.loading, self.lyrics_content, self.timeline
+
+    def shutdown(self) -> None:
+        """Stop accepting fetches; in-flight provider requests are abandoned."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class NegativeCacheRefresher:
+    """
+    Re-queries expired "not found" cache entries in the background, one at a time.
+    The daemon only calls refresh_one() while paused or idle.
+    """
+
+    # Pause after a retry that reached no provider (offline): the entry stays expired
+    UNREACHABLE_BACKOFF = 300.0
+
+    def __init__(self, on_found: Optional[Callable[[str], None]] = None):
+        # Called from the worker thread with the cache key that now has lyrics
+        self.on_found = on_found
+        self.refreshed = 0
+        self.found = 0
+        self._paused_until = float("-inf")
+        self._busy = threading.Event()
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lyrics-refresh")
+
+    def refresh_one(self) -> bool:
+        """Queue the most overdue miss, if any. Returns True if work was queued."""
+        if self._busy.is_set() or time.monotonic() < self._paused_until:
+            return False
+        import sqlite3
+
+        try:
+            entries = get_cache_store().expired_misses(limit=1)
+        except sqlite3.Error as e:
+            LOG.error("Failed to query cache for expired misses: %s", e)
+            return False
+        if not entries:
+            return False
+
+        self._busy.set()
+        self._executor.submit(self._refresh, entries[0])
+        return True
+
+    def _refresh(self, entry: CacheEntry) -> None:
+        try:
+            lyrics_content, _ = get_lyrics(
+                entry.artist or "", entry.title or "", entry.key, entry.duration
+            )
+        except TimeoutError as e:
+            # No provider answered (offline): the entry stays expired, back off
+            LOG.debug("Background refresh failed: %s", e)
+            self._paused_until = time.monotonic() + self.UNREACHABLE_BACKOFF
+            return
+        except Exception as e:
+            LOG.error("Background refresh failed: %s", e)
+            return
+        finally:
+            self.refreshed += 1
+            self._busy.clear()
+
+        if lyrics_content:
+            self.found += 1
+            LOG.info("Background refresh found lyrics for '%s' (%s)", entry.title, entry.artist)
+            if self.on_found:
+                self.on_found(entry.key)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class LyricsPrefetcher:
+    """
+    Warms the lyrics cache for upcoming tracks with a bounded concurrency budget.
+    Results land in the SQLite store and PARSED_LYRICS_CACHE, so the next track change hits.
+    """
+
+    MAX_WORKERS = 1  # leaves provider capacity for the track that is playing
+    MAX_PENDING = 8
+
+    def __init__(self):
+        self.submitted = 0
+        self.skipped = 0
+        self._in_flight: set[str] = set()
+        self._lock = threading.Lock()
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.MAX_WORKERS, thread_name_prefix="lyrics-prefetch"
+        )
+
+    def prefetch(self, tracks: list[dict], player: str) -> None:
+        """Queue raw {"title", "artist", "length_us"} metadata for background fetching."""
+        for track in tracks:
+            if not track.get("title"):
+                continue
+            title, artist, cache_key = resolve_track(track["title"], track["artist"], player)
+            if not title:
+                continue
+
+            with self._lock:
+                if cache_key in self._in_flight or len(self._in_flight) >= self.MAX_PENDING:
+                    self.skipped += 1
+                    continue
+                self._in_flight.add(cache_key)
+            self.submitted += 1
+            duration = track.get("length_us", 0) / 1_000_000.0 or None
+            self._executor.submit(self._fetch, artist, title, cache_key, duration)
+
+    def _fetch(
+        self, artist: str, title: str, cache_key: str, duration: Optional[float] = None
+    ) -> None:
+        try:
+            if PARSED_LYRICS_CACHE.get(cache_key) is not None:
+                return
+            lyrics_content, _ = get_lyrics(artist, title, cache_key, duration)
+            if lyrics_content:
+                PARSED_LYRICS_CACHE.put(cache_key, lyrics_content, LyricsTimeline.parse(lyrics_content))
+        except TimeoutError as e:
+            LOG.debug("Prefetch failed for '%s': %s", title, e)
+        except Exception as e:
+            LOG.error("Prefetch failed for '%s': %s", title, e)
+        finally:
+            with self._lock:
+                self._in_flight.discard(cache_key)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@dataclass
+class PlayerInfo:
+    """Cached proxy and signal-updated state for one MPRIS bus name."""
+
+    bus_name: str  # well-known name, e.g. org.mpris.MediaPlayer2.spotify
+    owner: str  # unique name (":1.42"); signals carry this as sender
+    identity: str
+    proxy: object  # pympris.MediaPlayer
+    properties: object  # org.freedesktop.DBus.Properties interface on the player object
+    status: str  # PlaybackStatus, kept current from PropertiesChanged
+    has_track_list: Optional[bool] = None  # HasTrackList, read on first upcoming_tracks()
+
+    def read_state(self) -> dict:
+        """Snapshot all player properties with a single GetAll round-trip."""
+        sent = time.monotonic()
+        props = self.properties.GetAll(MPRIS_PLAYER_INTERFACE)
+        received = time.monotonic()
+        METRICS.observe("dbus_call_seconds", received - sent, method="GetAll")
+        # The reply was produced somewhere in between; the midpoint halves the error
+        return state_from_properties(props, (sent + received) / 2)
+
+
+class MPRISPlayerMonitor:
+    """
+    Manages MPRIS connections and player lifecycle.
+    Players are tracked through NameOwnerChanged on one session bus connection;
+    priority decisions use the cached registry and never touch DBus.
+    """
+
+    def __init__(self, player_order: list[str]):
+        self.player_order = player_order
+        self.players: dict[str, PlayerInfo] = {}  # by bus name
+        # Bus name -> owner for players whose first read failed (e.g. the name was taken
+        # before the object was exported); retried by retry_pending()
+        self.pending: dict[str, str] = {}
+        self.bus = None
+        # Called after a player appears or disappears
+        self.on_players_changed: Optional[Callable[[], None]] = None
+        self.current_player: Optional[object] = None
+        self.current_player_name: Optional[str] = None
+        self.current_player_owner: Optional[str] = None
+
+    def start(self, bus) -> None:
+        """Register existing players and follow NameOwnerChanged from now on."""
+        self.bus = bus
+        bus.add_signal_receiver(
+            self._on_name_owner_changed,
+            signal_name="NameOwnerChanged",
+            dbus_interface="org.freedesktop.DBus",
+            path="/org/freedesktop/DBus",
+        )
+        for name in bus.list_names():
+            if name.startswith(MPRIS_BUS_PREFIX):
+                try:
+                    self._register(str(name), str(bus.get_name_owner(name)))
+                except Exception as e:
+                    LOG.debug("Failed to resolve owner of %s: %s", name, e)
+
+    def _register(self, bus_name: str, owner: str) -> Optional[PlayerInfo]:
+        """Create the one proxy for `bus_name` and read its identity and status once."""
+        try:
+            mp = pympris.MediaPlayer(bus_name, self.bus)
+            properties = dbus.Interface(
+                self.bus.get_object(bus_name, MPRIS_OBJECT_PATH, introspect=False),
+                DBUS_PROPERTIES_INTERFACE,
+            )
+            info = PlayerInfo(
+                bus_name=bus_name,
+                owner=owner,
+                identity=str(mp.root.Identity),
+                proxy=mp,
+                properties=properties,
+                status=str(mp.player.PlaybackStatus),
+            )
+        except Exception as e:
+            LOG.debug("Failed to register player %s: %s", bus_name, e)
+            self.pending[bus_name] = owner
+            return None
+
+        self.pending.pop(bus_name, None)
+        self.players[bus_name] = info
+        LOG.debug("Player appeared: %s (%s, %s)", info.identity, bus_name, info.status)
+        return info
+
+    def _on_name_owner_changed(self, name, old_owner, new_owner) -> None:
+        """Handle org.freedesktop.DBus.NameOwnerChanged for MPRIS bus names."""
+        if not name.startswith(MPRIS_BUS_PREFIX):
+            return
+        name = str(name)
+
+        self.pending.pop(name, None)
+        if self.players.pop(name, None) is not None:
+            LOG.debug("Player vanished: %s", name)
+        if name == self.current_player_name:
+            self.current_player = None
+        if new_owner:
+            self._register(name, str(new_owner))
+
+        if self.on_players_changed:
+            self.on_players_changed()
+
+    def retry_pending(self) -> None:
+        """Try again to register players whose first read failed."""
+        for bus_name, owner in list(self.pending.items()):
+            self._register(bus_name, owner)
+
+    def update_status(self, owner: str, status: str) -> None:
+        """Record a PlaybackStatus reported by the player with unique name `owner`."""
+        for info in self.players.values():
+            if info.owner == owner:
+                info.status = status
+
+    def current_info(self) -> Optional[PlayerInfo]:
+        if self.current_player is None or self.current_player_name is None:
+            return None
+        return self.players.get(self.current_player_name)
+
+    def priority_of(self, identity: str) -> Optional[int]:
+        """Index of `identity` in player_order (partial match), or None."""
+        for i, priority_name in enumerate(self.player_order):
+            if priority_name.lower() in identity.lower():
+                return i
+        return None
+
+    def select(self, info: PlayerInfo) -> None:
+        """Make `info` the current player."""
+        self.current_player = info.proxy
+        self.current_player_name = info.bus_name
+        self.current_player_owner = info.owner
+
+    def best_player(self, max_priority: Optional[int] = None) -> Optional[PlayerInfo]:
+        """Highest-priority Playing/Paused player, optionally only above `max_priority`."""
+        order = self.player_order if max_priority is None else self.player_order[:max_priority]
+        for priority_name in order:
+            for info in self.players.values():
+                # Match against identity, not bus name
+                if priority_name.lower() in info.identity.lower() and info.status in (
+                    "Playing",
+                    "Paused",
+                ):
+                    return info
+        return None
+
+    def find_active_player(self) -> Optional[object]:
+        """Find active player based on priority order."""
+        info = self.best_player()
+        if info is None:
+            return None
+        self.select(info)
+        LOG.debug("Selected player: %s (%s)", info.identity, info.bus_name)
+        return info.proxy
+
+    @staticmethod
+    def upcoming_tracks(info: PlayerInfo, trackid: str, limit: int) -> list[dict]:
+        """
+        Return raw {"title", "artist", "length_us"} metadata for the `limit` tracks after
+        `trackid` (the current track, from the state snapshot just read).
+        Only players implementing org.mpris.MediaPlayer2.TrackList can answer.
+        """
+        mp = info.proxy
+        try:
+            if info.has_track_list is None:
+                info.has_track_list = bool(mp.root.HasTrackList)
+            if not info.has_track_list:
+                return []
+            track_ids = list(mp.track_list.Tracks)
+            start = track_ids.index(trackid) + 1 if trackid in track_ids else 0
+            next_ids = track_ids[start : start + limit]
+            if not next_ids:
+                return []
+            metadata = mp.track_list.GetTracksMetadata(next_ids)
+        except Exception as e:
+            LOG.debug("TrackList lookup failed: %s", e)
+            return []
+
+        return [
+            {
+                "title": str(m.get("xesam:title", "")),
+                "artist": format_artist(m.get("xesam:artist", "")),
+                "length_us": int(m.get("mpris:length", 0)),
+            }
+            for m in metadata
+        ]
+
+    def reconnect_if_needed(self) -> bool:
+        """Check if current player is still valid, reconnect if not."""
+        # NameOwnerChanged keeps the registry current; no DBus round-trip needed
+        if self.current_player is not None and self.current_player_name in self.players:
+            return True
+        self.current_player = None
+
+        # Try to reconnect
+        result = self.find_active_player()
+        return result is not None
+
+
+class PlayerSession:
+    """
+    Tracking state for one live player: its own lyrics and interpolated position.
+    Sessions outlive selection changes, so switching the active player needs no refetch.
+    """
+
+    def __init__(
+        self,
+        bus_name: str,
+        executor,
+        on_lyrics_ready: Callable[[], None],
+        policy: Optional[SyncPolicy] = None,
+    ):
+        self.bus_name = bus_name
+        # Shared by every session of the same player identity
+        self.interpolator = PositionInterpolator(policy)
+        self.track_manager = TrackStateManager(on_lyrics_ready, executor)
+        self.last_status: Optional[str] = None
+
+    @property
+    def player(self) -> str:
+        """playerctl-style name, e.g. "spotify" or "brave.instance1234"."""
+        return self.bus_name.removeprefix(MPRIS_BUS_PREFIX)
+
+    @property
+    def is_playing(self) -> bool:
+        snapshot = self.interpolator.last_snapshot
+        return snapshot is not None and snapshot.status == "Playing"
+
+    def sync_due(self, watched: bool) -> bool:
+        """
+        Signals always force a sync; the periodic drift resync only matters for
+        sessions whose output someone is looking at.
+        """
+        if self.interpolator.needs_sync or self.interpolator.last_snapshot is None:
+            return True
+        return watched and self.interpolator.should_sync()
+
+
+def check_private_dir(directory: Path) -> None:
+    """Raise OSError unless `directory` is a real directory owned by this user and closed to others."""
+    import stat
+
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise OSError(f"{directory} is not a private directory of this user")
+
+
+def connect_daemon(path: Optional[Path] = None):
+    """
+    Connect to the daemon socket (timeout DAEMON_QUERY_TIMEOUT). Raises OSError if it
+    is not there or sits in a directory someone else could have put it in.
+    """
+    import socket
+
+    path = path or DAEMON_SOCKET_PATH
+    check_private_dir(path.parent)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(DAEMON_QUERY_TIMEOUT)
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def query_daemon(request: str, path: Optional[Path] = None) -> Optional[str]:
+    """
+    Send one request line to a running daemon and return its reply.
+    None if no daemon is listening or it could not answer the request.
+    """
+    try:
+        with connect_daemon(path) as sock:
+            sock.sendall(request.encode() + b"\n")
+            chunks = []
+            while chunk := sock.recv(65536):
+                chunks.append(chunk)
+    except OSError:
+        return None
+    reply = b"".join(chunks).decode(errors="replace")
+    return reply.removesuffix("\n") or None
+
+
+class DaemonSocketServer:
+    """
+    UNIX socket endpoint served from the daemon's GLib main loop.
+    Each connection carries one request line (e.g. "query waybar [target]"); the reply
+    is written back and the connection closed. An empty reply tells the client to
+    fall back to standalone mode. "subscribe ..." requests hand the connection over
+    to `on_subscribe`, which keeps it open if it accepts.
+    """
+
+    MAX_REQUEST = 1024
+    SEND_TIMEOUT = 0.5
+
+    def __init__(
+        self,
+        path: Path,
+        handler: Callable[[str], Optional[str]],
+        on_subscribe: Optional[Callable[[object, str], bool]] = None,
+    ):
+        self.path = path
+        self.handler = handler
+        self.on_subscribe = on_subscribe
+        self.sock = None
+        self._watch: Optional[int] = None
+
+    def start(self) -> None:
+        """Bind the socket (replacing a stale one) and start accepting on the main loop."""
+        import socket
+
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        check_private_dir(self.path.parent)
+        if self.path.exists():
+            if query_daemon("ping", self.path) is not None:
+                raise OSError(f"another daemon is already listening on {self.path}")
+            self.path.unlink()
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(str(self.path))
+        os.chmod(self.path, 0o600)
+        sock.listen(16)
+        sock.setblocking(False)
+        self.sock = sock
+        self._watch = GLib.io_add_watch(
+            sock.fileno(), GLib.PRIORITY_DEFAULT, GLib.IO_IN, self._on_accept
+        )
+
+    def _on_accept(self, fd, condition) -> bool:
+        try:
+            conn, _ = self.sock.accept()
+        except BlockingIOError:
+            return True
+        conn.setblocking(False)
+        GLib.io_add_watch(
+            conn.fileno(),
+            GLib.PRIORITY_DEFAULT,
+            GLib.IO_IN | GLib.IO_HUP | GLib.IO_ERR,
+            self._on_request,
+            conn,
+            bytearray(),
+        )
+        return True
+
+    def _on_request(self, fd, condition, conn, buffer: bytearray) -> bool:
+        """Collect the request line without blocking the loop, then answer it."""
+        try:
+            chunk = conn.recv(self.MAX_REQUEST)
+        except BlockingIOError:
+            return True
+        except OSError:
+            chunk = b""
+        buffer += chunk
+        if chunk and b"\n" not in buffer and len(buffer) < self.MAX_REQUEST:
+            return True  # wait for the rest of the line
+
+        reply = None
+        line = bytes(buffer).split(b"\n", 1)[0].decode(errors="replace").strip()
+        if line.startswith("subscribe") and self.on_subscribe is not None:
+            if self.on_subscribe(conn, line):
+                return False  # the subscriber owns the connection now
+        elif line:
+            try:
+                reply = self.handler(line)
+            except Exception as e:
+                LOG.error("Socket request %r failed: %s", line, e)
+        if reply:
+            try:
+                conn.settimeout(self.SEND_TIMEOUT)
+                conn.sendall(reply.encode() + b"\n")
+            except OSError:
+                pass
+        conn.close()
+        return False
+
+    def close(self) -> None:
+        if self._watch is not None:
+            GLib.source_remove(self._watch)
+            self._watch = None
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
 
-        # Clean title
-        cleaned_title, extracted_artist = clean_title(state["title"], state["artist"], player_name)
 
-        title = cleaned_title
-        artist = extracted_artist or state["artist"]
+def follow_daemon(fmt: str, path: Optional[Path] = None) -> bool:
+    """
+    Subscribe to a running daemon and copy its records to stdout until it goes away.
+    False if no daemon accepted the subscription. BrokenPipeError propagates: it means
+    our own reader went away, not the daemon.
+    """
+    try:
+        sock = connect_daemon(path)
+    except OSError:
+        return False
+    try:
+        sock.sendall(f"subscribe {fmt}\n".encode())
+        sock.settimeout(None)
+    except OSError:
+        sock.close()
+        return False
 
-        # Generate cache key using artist and title (unified with non-daemon mode)
-        cache_key = hashlib.md5(f"{artist}{title}".encode()).hexdigest()
+    received = False
+    with sock, sock.makefile("r", encoding="utf-8", errors="replace") as stream:
+        try:
+            for line in stream:
+                received = True
+                print(line, end="", flush=True)
+        except BrokenPipeError:
+            raise
+        except OSError:
+            pass
+    return received
+
+
+class StdoutSubscriber:
+    """Streams records to our own stdout (--follow without a daemon)."""
+
+    def __init__(self, fmt: str, on_close: Callable[[object], None]):
+        self.fmt = fmt
+        self.player: Optional[str] = None  # always the active view
+        self.last: Optional[str] = None
+        self.on_close = on_close
+
+    def send(self, record: str) -> None:
+        try:
+            print(record, flush=True)
+        except BrokenPipeError:
+            # Reader is gone; silence the final flush at exit
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            self.on_close(self)
 
-        # Fetch lyrics (uses cache if available)
-        self.lyrics_content, _ = get_lyrics(artist, title, cache_key)
 
-        # Parse lyrics
-        if self.lyrics_content:
-            self.lyrics_lines = self.lyrics_content.strip().split("\n")
-            self.is_synced = is_synced_lyrics(self.lyrics_content)
-        else:
-            self.lyrics_lines = []
-            self.is_synced = False
+class SocketSubscriber:
+    """
+    One streaming socket client.
+    Only the newest record matters, so while the client is slow to read, a queued
+    record is replaced by the next one instead of piling up; a client that stays
+    blocked for STALL_TIMEOUT is dropped.
+    """
 
+    STALL_TIMEOUT = 30.0
+
+    def __init__(
+        self,
+        conn,
+        fmt: str,
+        on_close: Callable[[object], None],
+        player: Optional[str] = None,
+    ):
+        self.conn = conn
+        self.fmt = fmt
+        self.player = player  # None: the active view, else a player name to follow
+        self.last: Optional[str] = None
+        self.on_close = on_close
+        self.closed = False
+        self.superseded = 0  # records replaced before they were sent
+        self._outbuf = b""  # rest of a partially sent record
+        self._pending: Optional[bytes] = None
+        self._blocked_since = 0.0
+        self._out_watch: Optional[int] = None
+        conn.setblocking(False)
+        # Clients never send after subscribing; readable means EOF or error
+        self._in_watch = GLib.io_add_watch(
+            conn.fileno(),
+            GLib.PRIORITY_DEFAULT,
+            GLib.IO_IN | GLib.IO_HUP | GLib.IO_ERR,
+            self._on_input,
+        )
 
-class MPRISPlayerMonitor:
-    """Manages MPRIS connections and player lifecycle."""
+    def send(self, record: str) -> None:
+        if self.closed:
+            return
+        if self._pending is not None:
+            self.superseded += 1
+        self._pending = record.encode() + b"\n"
+        if self._out_watch is not None:
+            # Still waiting for the client to drain the previous record
+            if time.monotonic() - self._blocked_since > self.STALL_TIMEOUT:
+                LOG.info("Dropping stalled subscriber")
+                self.close()
+            return
+        if not self._flush():
+            self._blocked_since = time.monotonic()
+            self._out_watch = GLib.io_add_watch(
+                self.conn.fileno(), GLib.PRIORITY_DEFAULT, GLib.IO_OUT, self._on_writable
+            )
 
-    def __init__(self, player_order: list[str]):
-        self.player_order = player_order
-        self.current_player: Optional[object] = None
-        self.current_player_name: Optional[str] = None
+    def _flush(self) -> bool:
+        """Send what the socket accepts; True once nothing is left to send."""
+        while self._outbuf or self._pending is not None:
+            if not self._outbuf:
+                self._outbuf, self._pending = self._pending, None
+            try:
+                sent = self.conn.send(self._outbuf)
+            except BlockingIOError:
+                return False
+            except OSError:
+                self.close()
+                return True
+            self._outbuf = self._outbuf[sent:]
+        return True
 
-    def find_active_player(self) -> Optional[object]:
-        """Find active player based on priority order."""
-        if not HAS_PYMPRIS:
-            return None
+    def _on_writable(self, fd, condition) -> bool:
+        if self._flush():
+            self._out_watch = None
+            return False
+        return True
 
-        # Get all available players
+    def _on_input(self, fd, condition) -> bool:
         try:
-            available = list(pympris.available_players())
-            print(f"[DEBUG] Available players: {available}", file=sys.stderr)
-        except Exception as e:
-            print(f"[DEBUG] Failed to get available players: {e}", file=sys.stderr)
-            return None
-
-        # Search in priority order using partial matching
-        for priority_name in self.player_order:
-            print(f"[DEBUG] Searching for priority: {priority_name}", file=sys.stderr)
-            for player_addr in available:
-                try:
-                    mp = pympris.MediaPlayer(player_addr)
-                    # Get player identity
-                    identity = mp.root.Identity
-                    print(
-                        f"[DEBUG]   Checking player: {player_addr} (Identity: {identity})",
-                        file=sys.stderr,
-                    )
-
-                    # Match against identity, not bus name
-                    if priority_name.lower() in identity.lower():
-                        status = mp.player.PlaybackStatus
-                        print(
-                            f"[DEBUG]   Match found! Status: {status}", file=sys.stderr
-                        )
-                        if status in ("Playing", "Paused"):
-                            self.current_player = mp
-                            self.current_player_name = player_addr
-                            print(
-                                f"[DEBUG]   Selected player: {identity} ({player_addr})",
-                                file=sys.stderr,
-                            )
-                            return mp
-                except Exception as e:
-                    print(
-                        f"[DEBUG]   Exception with {player_addr}: {e}", file=sys.stderr
-                    )
-                    continue
-
-        print(f"[DEBUG] No matching player found", file=sys.stderr)
-        return None
-
-    def reconnect_if_needed(self) -> bool:
-        """Check if current player is still valid, reconnect if not."""
-        if self.current_player:
-            try:
-                # Test connection with a simple property access
-                _ = self.current_player.player.PlaybackStatus
+            if self.conn.recv(1024):
                 return True
-            except Exception:
-                self.current_player = None
+        except BlockingIOError:
+            return True
+        except OSError:
+            pass
+        self._in_watch = None
+        self.close()
+        return False
 
-        # Try to reconnect
-        result = self.find_active_player()
-        return result is not None
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        for watch in (self._in_watch, self._out_watch):
+            if watch is not None:
+                GLib.source_remove(watch)
+        self._in_watch = self._out_watch = None
+        self._outbuf, self._pending = b"", None
+        self.conn.close()
+        self.on_close(self)
 
 
 class LyricsDaemon:
-    """Main daemon orchestrator - outputs lyrics JSON every 50ms."""
+    """
+    Main daemon orchestrator - event-driven on MPRIS signals.
+    Output is re-rendered on PropertiesChanged/Seeked and at the next lyric boundary,
+    then written to `output_file` and pushed to stream subscribers when it changed.
+    """
 
-    UPDATE_INTERVAL = 0.05  # 50ms = 20Hz
     PRIORITY_CHECK_INTERVAL = 5.0  # 5秒ごとに優先順位チェック
-
-    def __init__(self):
+    REFRESH_INTERVAL = 60  # seconds between background retries of cached misses
+    PREFETCH_COUNT = 3  # upcoming tracks to warm on each track change
+    MIN_TICK_INTERVAL = 0.005  # floor for timer-scheduled ticks
+    # A tick that renders later than this after it was due counts as a missed deadline
+    TICK_DEADLINE = 0.05
+    # Wall clock vs. monotonic divergence (or a tick this late) means the machine was
+    # suspended or the clock was stepped; every player is resynced
+    CLOCK_JUMP_THRESHOLD = 1.0
+
+    # Player properties whose change requires a fresh MPRIS sync
+    SYNC_PROPERTIES = ("PlaybackStatus", "Metadata", "Rate")
+
+    def __init__(
+        self,
+        output_file: Optional[Path] = DAEMON_OUTPUT_FILE,
+        player_order: Optional[list[str]] = None,
+        serve: bool = True,
+        metrics_file: Optional[Path] = DAEMON_METRICS_FILE,
+    ):
         self.running = True
-        self.monitor = MPRISPlayerMonitor(["brave", "spotify"])
-        self.interpolator = PositionInterpolator()
-        self.track_manager = TrackStateManager(CACHE_DIR)
-        self.last_priority_check = 0.0
-        self.last_status = None
-
-        # Setup signal handlers for graceful shutdown
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        self.output_file = output_file
+        # Prometheus dump written on SIGUSR1 (None: log the report only)
+        self.metrics_file = metrics_file
+        self.monitor = MPRISPlayerMonitor(player_order or PLAYER_ORDER)
+        # One session per live tracked player, by bus name; the monitor's current
+        # player only selects which one is the active view
+        self.sessions: dict[str, PlayerSession] = {}
+        # Learned resync intervals by player identity; they outlive sessions
+        self.sync_policies: dict[str, SyncPolicy] = {}
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.fetch_executor = ThreadPoolExecutor(
+            max_workers=TrackStateManager.FETCH_WORKERS, thread_name_prefix="lyrics-fetch"
+        )
+        self.refresher = NegativeCacheRefresher(self._on_refresh_found)
+        self.prefetcher = LyricsPrefetcher()
+        self.last_priority_check = float("-inf")
+        self.loop: Optional["GLib.MainLoop"] = None
+        self._tick_source: Optional[int] = None
+        self._tick_due = time.monotonic()  # when the armed tick should fire
+        # (time.time(), time.monotonic()) at the previous tick, for suspend detection
+        self._clock_anchor = (time.time(), time.monotonic())
+        # Last payload written to output_file; identical payloads are skipped
+        self.last_output: Optional[str] = None
+        self.writes_issued = 0
+        self.writes_skipped = 0
+        # Stream consumers (StdoutSubscriber / SocketSubscriber), each with its own format
+        self.subscribers: list = []
+        self.last_published: Optional[dict] = None
+        self.server = (
+            DaemonSocketServer(DAEMON_SOCKET_PATH, self._handle_request, self._on_subscribe)
+            if serve
+            else None
+        )
 
-    def _signal_handler(self, signum, frame):
+    def _signal_handler(self, signum, frame=None):
         """Handle shutdown signals gracefully."""
         self.running = False
+        if self.loop is not None:
+            self.loop.quit()
+        return False
 
     def run(self) -> None:
         """Main daemon loop."""
-        if not HAS_PYMPRIS:
+        # Setup signal handlers for graceful shutdown (here, not in __init__, so merely
+        # constructing a daemon leaves the process's handlers alone)
+        signal.signal(signal.SIGINT, self._signal_handler)
+        signal.signal(signal.SIGTERM, self._signal_handler)
+
+        missing = load_daemon_modules()
+        if missing:
             print(
-                "Error: pympris not installed. Install with: uv add pympris",
+                f"Error: {missing} not installed. Install with: uv add {missing}",
                 file=sys.stderr,
             )
             print(json.dumps({"status": "error", "lines": []}))
             sys.exit(1)
 
-        # Write PID file
-        try:
-            DAEMON_PID_FILE.write_text(str(os.getpid()))
-        except Exception as e:
-            print(f"[ERROR] Failed to write PID file: {e}", file=sys.stderr)
-            # Proceed even if PID file write fails, but log it.
-
-        # Daemon startup notification
-        print(
-            f"[INFO] Lyrics daemon started. Output file: {DAEMON_OUTPUT_FILE}",
-            file=sys.stderr,
+        # Must be set before the first SessionBus() so signals reach the GLib loop
+        DBusGMainLoop(set_as_default=True)
+        self.loop = GLib.MainLoop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signum, self._signal_handler, signum)
+        GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signal.SIGUSR1, self._on_report_signal)
+
+        bus = dbus.SessionBus()
+        bus.add_signal_receiver(
+            self._on_properties_changed,
+            signal_name="PropertiesChanged",
+            dbus_interface=DBUS_PROPERTIES_INTERFACE,
+            path=MPRIS_OBJECT_PATH,
+            sender_keyword="sender",
         )
-        sys.stderr.flush()
+        bus.add_signal_receiver(
+            self._on_seeked,
+            signal_name="Seeked",
+            dbus_interface=MPRIS_PLAYER_INTERFACE,
+            path=MPRIS_OBJECT_PATH,
+            sender_keyword="sender",
+        )
+        self.monitor.on_players_changed = self._on_players_changed
+        self.monitor.start(bus)
 
-        try:
-            while self.running:
-                loop_start = time.time()
+        if self.server is not None:
+            try:
+                self.server.start()
+            except OSError as e:
+                LOG.error("Cannot serve %s: %s", DAEMON_SOCKET_PATH, e)
+                sys.exit(1)
 
-                try:
-                    self._process_iteration()
-                except Exception as e:
-                    # Log error but keep running
-                    import traceback
+            # Write PID file
+            try:
+                DAEMON_PID_FILE.write_text(str(os.getpid()))
+            except Exception as e:
+                LOG.error("Failed to write PID file: %s", e)
+                # Proceed even if PID file write fails, but log it.
 
-                    print(f"[ERROR] {e}", file=sys.stderr)
-                    traceback.print_exc(file=sys.stderr)
+        # Daemon startup notification
+        LOG.info("Lyrics daemon started. Output file: %s", self.output_file or "(none)")
+        sys.stderr.flush()
 
-                # Sleep to maintain 20Hz update rate
-                elapsed = time.time() - loop_start
-                sleep_time = max(0, self.UPDATE_INTERVAL - elapsed)
-                time.sleep(sleep_time)
+        try:
+            self._schedule_tick(0)
+            GLib.timeout_add_seconds(self.REFRESH_INTERVAL, self._on_refresh_timer)
+            if self.running:
+                self.loop.run()
         finally:
+            # In-flight provider requests are abandoned
+            self.fetch_executor.shutdown(wait=False, cancel_futures=True)
+            self.refresher.shutdown()
+            self.prefetcher.shutdown()
+            if self.server is not None:
+                self.server.close()
+            LOG.info("Parsed lyrics cache: %s", PARSED_LYRICS_CACHE.format_stats())
+            if _lyrics_fetcher is not None:
+                LOG.info("Provider stats: %s", _lyrics_fetcher.format_stats())
             # Clean up PID file on exit
-            if DAEMON_PID_FILE.exists():
+            if self.server is not None and DAEMON_PID_FILE.exists():
                 try:
                     DAEMON_PID_FILE.unlink()
                 except Exception:
                     pass
-            print("[INFO] Lyrics daemon stopped.", file=sys.stderr)
+            LOG.info(
+                "Lyrics daemon stopped. Output writes: %d issued, %d skipped",
+                self.writes_issued, self.writes_skipped,
+            )
+
+    def _schedule_tick(self, delay: float) -> None:
+        """(Re)arm the single tick timer to fire after `delay` seconds."""
+        if self._tick_source is not None:
+            GLib.source_remove(self._tick_source)
+        # Round up so we never wake just before a lyric boundary
+        delay_ms = math.ceil(delay * 1000)
+        self._tick_due = time.monotonic() + delay_ms / 1000
+        self._tick_source = GLib.timeout_add(delay_ms, self._on_tick)
+
+    def _on_tick(self) -> bool:
+        """Timer callback: process one iteration and schedule the next one."""
+        self._tick_source = None
+        started = time.monotonic()
+        self._check_clock_jump(started)
+        try:
+            self._process_iteration()
+        except Exception as e:
+            # Log error but keep running
+            import traceback
+
+            if LOG.error("Tick failed: %s", e):
+                traceback.print_exc(file=sys.stderr)
+
+        finished = time.monotonic()
+        METRICS.observe("tick_seconds", finished - started)
+        METRICS.observe("tick_lateness_seconds", max(0.0, started - self._tick_due))
+        if finished - self._tick_due > self.TICK_DEADLINE:
+            METRICS.inc("deadline_misses_total")
+
+        if self.running:
+            self._schedule_tick(self._next_delay())
+        return False
+
+    def _check_clock_jump(self, now: float) -> None:
+        """
+        Resync every player after a suspend/resume or a stalled loop.
+        CLOCK_MONOTONIC stops while suspended but the wall clock does not, so a
+        suspend shows up as the two clocks drifting apart between ticks.
+        """
+        wall = time.time()
+        last_wall, last_now = self._clock_anchor
+        self._clock_anchor = (wall, now)
+        gap = (wall - last_wall) - (now - last_now)
+        late = now - self._tick_due
+        if abs(gap) < self.CLOCK_JUMP_THRESHOLD and late < self.CLOCK_JUMP_THRESHOLD:
+            return
+        LOG.info(
+            "Clock jump detected (wall clock %+.1fs, tick %.1fs late) - resyncing players",
+            gap, max(0.0, late),
+        )
+        METRICS.inc("clock_jumps_total")
+        for session in self.sessions.values():
+            session.interpolator.needs_sync = True
+        self.last_priority_check = float("-inf")
+
+    def _next_delay(self) -> float:
+        """Seconds until the next tick is needed (next boundary, resync or priority check)."""
+        now = time.monotonic()
+        delay = self.PRIORITY_CHECK_INTERVAL - (now - self.last_priority_check)
+
+        # Only sessions someone is looking at need boundary wakeups; paused/idle
+        # sessions move nothing until a signal arrives
+        for session in self._watched_sessions():
+            if not session.is_playing:
+                continue
+            interpolator = session.interpolator
+            delay = min(delay, interpolator.sync_interval - (now - interpolator.last_sync_time))
+
+            position = interpolator.get_interpolated_position()
+            rate = interpolator.last_snapshot.rate
+            boundary = session.track_manager.timeline.next_boundary(position)
+            if boundary is not None and rate > 0:
+                delay = min(delay, (boundary - position) / rate)
+
+        return max(delay, self.MIN_TICK_INTERVAL)
+
+    def _on_properties_changed(self, interface, changed, invalidated, sender=None) -> None:
+        """Handle org.freedesktop.DBus.Properties.PropertiesChanged from any player."""
+        if interface != MPRIS_PLAYER_INTERFACE:
+            return
+        if not any(key in changed for key in self.SYNC_PROPERTIES):
+            return
+        if sender is None:
+            return
+        if "PlaybackStatus" in changed:
+            self.monitor.update_status(sender, str(changed["PlaybackStatus"]))
+            # A player started/stopped - re-evaluate priority now
+            self.last_priority_check = float("-inf")
+
+        session = self._session_for_owner(sender)
+        if session is not None:
+            # Track, status or rate changed - resync that player right away
+            session.interpolator.needs_sync = True
+        elif "PlaybackStatus" not in changed:
+            return
+        self._schedule_tick(0)
+
+    def _on_players_changed(self) -> None:
+        """A player appeared or vanished - drop its session and re-evaluate selection now."""
+        for bus_name in list(self.sessions):
+            if bus_name not in self.monitor.players:
+                del self.sessions[bus_name]
+        self.last_priority_check = float("-inf")
+        self._schedule_tick(0)
+
+    def _on_lyrics_ready(self) -> None:
+        """Called from a fetch worker thread; re-render on the main loop."""
+        if self.loop is not None:
+            GLib.idle_add(self._schedule_tick, 0)
+
+    def _on_refresh_timer(self) -> bool:
+        """Retry one expired cache miss, but only while nothing is playing."""
+        if not any(session.is_playing for session in self.sessions.values()):
+            self.refresher.refresh_one()
+        return True  # keep the timer
+
+    def _on_refresh_found(self, cache_key: str) -> None:
+        """Called from the refresher thread; reload if a live session shows that track."""
+        if self.loop is not None:
+            GLib.idle_add(self._reload_if_current, cache_key)
+
+    def _reload_if_current(self, cache_key: str) -> bool:
+        for session in self.sessions.values():
+            if cache_key == session.track_manager.current_cache_key:
+                # Force check_track_change() to refetch on the next sync
+                session.track_manager.current_trackid = None
+                session.track_manager.current_title = None
+                session.interpolator.needs_sync = True
+                self._schedule_tick(0)
+        return False
+
+    def _on_seeked(self, position_us, sender=None) -> None:
+        """Handle org.mpris.MediaPlayer2.Player.Seeked from any tracked player."""
+        session = self._session_for_owner(sender)
+        if session is None:
+            return
+        session.interpolator.handle_seek(position_us / 1_000_000.0)
+        self._schedule_tick(0)
+
+    def _session_for_owner(self, owner: Optional[str]) -> Optional[PlayerSession]:
+        """Session of the player with unique bus name `owner` (signal sender)."""
+        if owner is None:
+            return None
+        for session in self.sessions.values():
+            info = self.monitor.players.get(session.bus_name)
+            if info is not None and info.owner == owner:
+                return session
+        return None
+
+    def active_session(self) -> Optional[PlayerSession]:
+        """Session of the selected player - what the output file and default view show."""
+        info = self.monitor.current_info()
+        if info is None:
+            return None
+        return self.sessions.get(info.bus_name)
+
+    def find_session(self, target: str) -> Optional[PlayerSession]:
+        """Session whose bus name contains `target` (case-insensitive), preferring the playing one."""
+        target = target.lower()
+        matches = [s for s in self.sessions.values() if target in s.bus_name.lower()]
+        matches.sort(key=lambda s: not s.is_playing)
+        return matches[0] if matches else None
+
+    def _watched_sessions(self) -> list[PlayerSession]:
+        """The active session plus sessions with a per-player subscriber."""
+        watched = []
+        active = self.active_session()
+        if active is not None:
+            watched.append(active)
+        for subscriber in self.subscribers:
+            if subscriber.player:
+                session = self.find_session(subscriber.player)
+                if session is not None and session not in watched:
+                    watched.append(session)
+        return watched
+
+    def _handle_request(self, line: str) -> Optional[str]:
+        """
+        Answer one socket request: "ping", "players", "stats" (JSON, with the
+        resync policies), "metrics" (Prometheus text) or "query <format> [target]".
+        """
+        command, *args = line.split(maxsplit=2)
+        if command == "ping":
+            return "pong"
+        if command == "players":
+            return self.format_players()
+        if command == "stats":
+            self._collect_metrics()
+            stats = METRICS.snapshot()
+            stats["sync_policies"] = [p.to_dict() for p in self.sync_policies.values()]
+            return json.dumps(stats, ensure_ascii=False)
+        if command == "metrics":
+            self._collect_metrics()
+            return METRICS.format_prometheus().removesuffix("\n")
+        if command == "query" and args and args[0] in OUTPUT_FORMATS:
+            return self.render(args[0], args[1] if len(args) > 1 else None, progress=True)
+        return None
+
+    def format_players(self) -> str:
+        """One JSON line listing the tracked players and which one is active."""
+        active = self.active_session()
+        return json.dumps(
+            [
+                {
+                    "player": session.player,
+                    "status": session.last_status,
+                    "title": session.track_manager.resolved_title,
+                    "artist": session.track_manager.resolved_artist,
+                    "active": session is active,
+                    "sync_interval_s": round(session.interpolator.sync_interval, 2),
+                }
+                for session in self.sessions.values()
+            ],
+            ensure_ascii=False,
+        )
+
+    def render(self, fmt: str, target: Optional[str] = None, progress: bool = False) -> Optional[str]:
+        """
+        Render the live state like the one-shot CLI would: the active player, or the
+        player matching `target`. None if the daemon cannot answer (e.g. `target` is
+        playing but not one of the players it tracks). `progress` as in render_lyrics().
+        """
+        if target:
+            session = self.find_session(target)
+            if session is None:
+                target = target.lower()
+                if any(
+                    target in p.bus_name.lower() and p.status in ("Playing", "Paused")
+                    for p in self.monitor.players.values()
+                ):
+                    return None  # playing, but outside player_order
+                return render_status(fmt, "stopped")
+        else:
+            session = self.active_session()
+
+        info = self.monitor.players.get(session.bus_name) if session is not None else None
+        if info is None or info.status not in ("Playing", "Paused"):
+            return render_status(fmt, "stopped")
+        if session.interpolator.last_snapshot is None:
+            return None  # not synced yet
+
+        tracks = session.track_manager
+        title, artist = tracks.resolved_title, tracks.resolved_artist
+        if not title:
+            return render_status(fmt, "no_info")
+        loading, lyrics_content, timeline = tracks.snapshot()
+        if loading:
+            return render_status(fmt, "loading", title, artist)
+        if not lyrics_content:
+            return render_status(fmt, "no_lyrics", title, artist)
+
+        position = session.interpolator.get_interpolated_position()
+        return render_lyrics(
+            fmt, lyrics_content, timeline, position, title, artist, session.player, progress
+        )
 
     def _process_iteration(self) -> None:
         """Process one iteration of the daemon loop."""
         # 定期的に優先順位の高いプレイヤーをチェック
-        current_time = time.time()
+        current_time = time.monotonic()
         if current_time - self.last_priority_check >= self.PRIORITY_CHECK_INTERVAL:
+            if self.monitor.pending:
+                self.monitor.retry_pending()
             self._check_priority()
             self.last_priority_check = current_time
 
-        # Check player connection
-        if not self.monitor.current_player:
-            # Attempt to find a player
-            if not self.monitor.find_active_player():
-                # No player found
-                self._write_json_file({"status": "stopped", "lines": []})
-                return
+        # Check player connection (finds the best player if there is none)
+        if not self.monitor.reconnect_if_needed():
+            self._publish({"status": "stopped", "lines": []})
+            return
 
-        mp = self.monitor.current_player
+        # Sync every player that needs it (on signals, every 5s when watched, on first run)
+        self._sync_sessions()
 
-        # Check if player is still alive
-        if not self.monitor.reconnect_if_needed():
-            self._write_json_file({"status": "stopped", "lines": []})
+        session = self.active_session()
+        if session is None or session.interpolator.last_snapshot is None:
+            # Player died before its first sync
+            self.monitor.current_player = None
             return
 
-        # Sync with MPRIS if needed (every 5s or on first run)
-        if self.interpolator.should_sync():
-            state = self._get_current_state(mp)
+        # Get interpolated position
+        position = session.interpolator.get_interpolated_position()
+
+        # Generate output
+        started = time.perf_counter()
+        output = self._generate_output(session, position)
+        METRICS.observe("render_seconds", time.perf_counter() - started, view="active")
+        self._publish(output)
+
+    def _sync_sessions(self) -> None:
+        """Create sessions for new tracked players and resync those that are due."""
+        active_name = self.monitor.current_player_name
+        watched = self._watched_sessions()
+        for bus_name, info in list(self.monitor.players.items()):
+            if self.monitor.priority_of(info.identity) is None:
+                continue  # not in player_order
+            session = self.sessions.get(bus_name)
+            if session is None:
+                if info.status not in ("Playing", "Paused"):
+                    continue
+                policy = self.sync_policies.get(info.identity)
+                if policy is None:
+                    policy = self.sync_policies[info.identity] = SyncPolicy(info.identity)
+                session = PlayerSession(
+                    bus_name, self.fetch_executor, self._on_lyrics_ready, policy
+                )
+                self.sessions[bus_name] = session
+            if not session.sync_due(session in watched):
+                continue
+
+            METRICS.inc("player_syncs_total", player=info.identity)
+            state = self._get_state(info)
             if state is None:
-                # Player died
-                self.monitor.current_player = None
-                return
+                if bus_name == active_name:
+                    # Player died
+                    self.monitor.current_player = None
+                continue
 
             # Check for track changes
-            if self.track_manager.check_track_change(state):
+            tracks = session.track_manager
+            if tracks.check_track_change(state):
                 # New track - fetch lyrics
-                player_name = self.monitor.current_player_name or "unknown"
-                self.track_manager.update_track(state, player_name)
+                tracks.update_track(state, bus_name)
+                if bus_name == active_name:
+                    # Warm the cache for what comes next
+                    upcoming = self.monitor.upcoming_tracks(
+                        info, state["trackid"], self.PREFETCH_COUNT
+                    )
+                    self.prefetcher.prefetch(upcoming, bus_name)
 
             # Update interpolator
-            self.interpolator.update_from_mpris(state)
+            session.interpolator.update_from_mpris(state)
+            self.monitor.update_status(info.owner, state["status"])
 
             # Log status change
-            if state["status"] != self.last_status:
-                print(f"[INFO] Player status changed: {self.last_status} -> {state['status']} (Player: {self.monitor.current_player_name})", file=sys.stderr)
-                self.last_status = state["status"]
-
-        # Get interpolated position
-        position = self.interpolator.get_interpolated_position()
-
-        # Generate output
-        output = self._generate_output(position)
-        self._write_json_file(output)
+            if state["status"] != session.last_status:
+                LOG.info(
+                    "Player status changed: %s -> %s (Player: %s)",
+                    session.last_status, state["status"], bus_name,
+                )
+                session.last_status = state["status"]
 
-    def _get_current_state(self, mp: object) -> Optional[dict]:
-        """Extract current playback state from MPRIS player."""
+    @staticmethod
+    def _get_state(info: PlayerInfo) -> Optional[dict]:
+        """Extract current playback state from one player (one GetAll call)."""
         try:
-            status = mp.player.PlaybackStatus
-            position_us = mp.player.Position  # microseconds
-            position = position_us / 1_000_000.0  # convert to seconds
-            metadata = mp.player.Metadata
-            rate = mp.player.Rate
-
-            # Handle xesam:artist which can be a list
-            artist = metadata.get("xesam:artist", "")
-            if isinstance(artist, list):
-                artist = ", ".join(artist) if artist else ""
-
-            return {
-                "status": status,
-                "position": position,
-                "rate": rate,
-                "trackid": metadata.get("mpris:trackid", ""),
-                "title": metadata.get("xesam:title", ""),
-                "artist": artist,
-                "length_us": metadata.get("mpris:length", 0),
-            }
+            return info.read_state()
         except Exception:
             return None
 
-    def _generate_output(self, position: float) -> dict:
-        """Generate JSON output for current position."""
-        if not self.track_manager.lyrics_lines:
-            return {"status": "no_lyrics", "lines": []}
-
-        # Reuse existing output logic
-        json_str = output_json(
-            self.track_manager.lyrics_lines, position, self.track_manager.is_synced
-        )
-        return json.loads(json_str)
+    @staticmethod
+    def _generate_output(session: PlayerSession, position: float) -> dict:
+        """Generate JSON output for a session at `position`."""
+        # One locked read: a fetch finishing mid-render cannot mix loading and timeline
+        loading, _, timeline = session.track_manager.snapshot()
+        if loading:
+            return {"status": "loading", "lines": []}
+        return build_json_output(timeline, position)
 
     @staticmethod
     def _output_json_line(data: dict) -> None:
@@ -777,72 +3477,341 @@ class LyricsDaemon:
         print(json_str, flush=True)  # flush=True is CRITICAL
 
     def _check_priority(self) -> None:
-        """Check if a higher priority player is available."""
-        if not self.monitor.current_player:
-            return
-
-        # 現在のプレイヤーのIdentityを取得
-        try:
-            current_identity = self.monitor.current_player.root.Identity
-        except Exception:
-            self.monitor.current_player = None
+        """Check if a higher priority player is available (registry only, no DBus calls)."""
+        info = self.monitor.current_info()
+        if info is None:
             return
 
         # 現在のプレイヤーの優先順位を取得
-        current_priority = None
-        for i, priority_name in enumerate(self.monitor.player_order):
-            if priority_name.lower() in current_identity.lower():
-                current_priority = i
-                break
-
+        current_priority = self.monitor.priority_of(info.identity)
         if current_priority is None:
             # 現在のプレイヤーが優先リストにない → 再検索
             self.monitor.current_player = None
             return
 
-        # 利用可能なプレイヤーをすべて取得
-        try:
-            available = list(pympris.available_players())
-        except Exception:
-            return
-
         # より優先順位の高いプレイヤーが再生中かチェック
-        for i in range(current_priority):
-            priority_name = self.monitor.player_order[i]
-
-            # 利用可能なプレイヤーの中から部分一致で検索
-            for player_addr in available:
-                try:
-                    mp = pympris.MediaPlayer(player_addr)
-                    identity = mp.root.Identity
-                    # Match against identity, not bus name
-                    if priority_name.lower() in identity.lower():
-                        status = mp.player.PlaybackStatus
-                        if status in ("Playing", "Paused"):
-                            # より優先順位の高いプレイヤーが見つかった
-                            print(
-                                f"[INFO] Found higher priority player! Switching to {identity} ({player_addr})",
-                                file=sys.stderr,
-                            )
-                            self.monitor.current_player = mp
-                            self.monitor.current_player_name = player_addr
-                            # トラック状態をリセットして歌詞を再取得させる
-                            self.track_manager.current_trackid = None
-                            return
-                except Exception:
-                    continue
+        better = self.monitor.best_player(current_priority)
+        if better is None and info.status not in ("Playing", "Paused"):
+            # 現在のプレイヤーが停止した → 再生中の別プレイヤーへ
+            better = self.monitor.best_player()
+        if better is not None:
+            LOG.info("Switching to %s (%s)", better.identity, better.bus_name)
+            self.monitor.select(better)
+            # The player's session already holds its lyrics; only refresh the position
+            session = self.sessions.get(better.bus_name)
+            if session is not None:
+                session.interpolator.needs_sync = True
+
+    def _on_subscribe(self, conn, line: str) -> bool:
+        """
+        Socket request "subscribe <json|waybar> [player]": stream records on this
+        connection, for the active view or one player's topic.
+        """
+        args = line.split(maxsplit=2)
+        fmt = args[1] if len(args) > 1 else "json"
+        if fmt not in STREAM_FORMATS:
+            return False
+        player = args[2] if len(args) > 2 else None
+        self.add_subscriber(SocketSubscriber(conn, fmt, self.remove_subscriber, player))
+        if player:
+            # Its session may not be watched yet
+            self._schedule_tick(0)
+        return True
+
+    def add_subscriber(self, subscriber) -> None:
+        """Start streaming to `subscriber`, beginning with the current state."""
+        self.subscribers.append(subscriber)
+        if self.last_published is not None:
+            record = self._stream_record(subscriber, self.last_published)
+            if record is not None:
+                subscriber.last = record
+                subscriber.send(record)
+
+    def remove_subscriber(self, subscriber) -> None:
+        if subscriber in self.subscribers:
+            self.subscribers.remove(subscriber)
+        if self.server is None and not self.subscribers:
+            # --follow: the only reader went away
+            self._signal_handler(None)
+
+    def _stream_record(self, subscriber, data: dict) -> Optional[str]:
+        """
+        One NDJSON record: the daemon's JSON payload for the active view,
+        otherwise the subscriber's format rendered for its player.
+        """
+        if subscriber.fmt == "json" and not subscriber.player:
+            return json.dumps(data, ensure_ascii=False)
+        return self.render(subscriber.fmt, subscriber.player)
+
+    def _publish(self, data: dict) -> None:
+        """Write the output file and push changed records to subscribers."""
+        self.last_published = data
+        if self.output_file is not None:
+            self._write_json_file(data)
+        rendered: dict[tuple, Optional[str]] = {}
+        for subscriber in list(self.subscribers):
+            topic = (subscriber.fmt, subscriber.player)
+            if topic not in rendered:
+                started = time.perf_counter()
+                rendered[topic] = self._stream_record(subscriber, data)
+                METRICS.observe("render_seconds", time.perf_counter() - started, view="stream")
+            record = rendered[topic]
+            # Records only go out when the visible line/state changed
+            if record is None or record == subscriber.last:
+                continue
+            subscriber.last = record
+            subscriber.send(record)
+
+    def _write_json_file(self, data: dict) -> None:
+        """Write JSON to daemon output file (atomic write), skipping unchanged payloads."""
+        json_str = json.dumps(data, ensure_ascii=False)
+        if json_str == self.last_output:
+            self.writes_skipped += 1
+            return
 
-    @staticmethod
-    def _write_json_file(data: dict) -> None:
-        """Write JSON to daemon output file (atomic write)."""
+        started = time.perf_counter()
         try:
-            json_str = json.dumps(data, ensure_ascii=False)
             # Atomic write: write to temp file first, then rename
-            temp_file = DAEMON_OUTPUT_FILE.with_suffix(".tmp")
+            temp_file = self.output_file.with_suffix(".tmp")
             temp_file.write_text(json_str)
-            temp_file.replace(DAEMON_OUTPUT_FILE)
+            temp_file.replace(self.output_file)
+            self.last_output = json_str
+            self.writes_issued += 1
         except Exception as e:
-            print(f"[ERROR] Failed to write daemon output file: {e}", file=sys.stderr)
+            LOG.error("Failed to write daemon output file: %s", e)
+        METRICS.observe("output_write_seconds", time.perf_counter() - started)
+
+    def _collect_metrics(self) -> None:
+        """Copy state kept elsewhere (caches, write counts, sessions) into METRICS gauges."""
+        METRICS.set("sessions", len(self.sessions))
+        METRICS.set("subscribers", len(self.subscribers))
+        METRICS.set("output_writes", self.writes_issued, result="issued")
+        METRICS.set("output_writes", self.writes_skipped, result="skipped")
+        METRICS.set("parsed_cache_lookups", PARSED_LYRICS_CACHE.hits, result="hit")
+        METRICS.set("parsed_cache_lookups", PARSED_LYRICS_CACHE.misses, result="miss")
+        METRICS.set("parsed_cache_bytes", PARSED_LYRICS_CACHE.total_bytes)
+        METRICS.set("log_messages_suppressed", LOG.suppressed)
+        for identity, policy in self.sync_policies.items():
+            METRICS.set("sync_interval_seconds", policy.interval, player=identity)
+
+    def _on_report_signal(self) -> bool:
+        """SIGUSR1: log a metrics report and rewrite the Prometheus dump file."""
+        self._collect_metrics()
+        LOG.info(METRICS.format_report(), limited=False)
+        if self.metrics_file is not None:
+            try:
+                temp_file = self.metrics_file.with_suffix(".tmp")
+                temp_file.write_text(METRICS.format_prometheus())
+                temp_file.replace(self.metrics_file)
+            except OSError as e:
+                LOG.error("Failed to write metrics file: %s", e)
+        return True  # keep the handler installed
+
+
+# ============================================================================
+# Cache Warm-up
+# ============================================================================
+
+AUDIO_EXTENSIONS = {".mp3", ".flac", ".ogg", ".oga", ".opus", ".m4a", ".mp4", ".wav", ".wma"}
+
+
+def _split_artist_title(text: str) -> tuple[str, str]:
+    """Split "Artist - Title"; without a separator the whole text is the title."""
+    if " - " in text:
+        artist, title = text.split(" - ", 1)
+        return artist.strip(), title.strip()
+    return "", text.strip()
+
+
+def read_audio_tags(path: Path) -> tuple[str, str]:
+    """Return (artist, title) from audio tags, falling back to the file name."""
+    try:
+        import mutagen  # optional: only needed for tagged audio files
+    except ImportError:
+        mutagen = None
+
+    if mutagen is not None:
+        try:
+            audio = mutagen.File(path, easy=True)
+            if audio is not None and audio.tags:
+                title = (audio.tags.get("title") or [""])[0]
+                artist = (audio.tags.get("artist") or [""])[0]
+                if title:
+                    return artist, title
+        except Exception:
+            pass
+    return _split_artist_title(path.stem)
+
+
+def _read_m3u(path: Path) -> Iterator[tuple[str, str]]:
+    extinf = None
+    for line in path.read_text(errors="replace").splitlines():
+        line = line.strip()
+        if line.startswith("#EXTINF:"):
+            # #EXTINF:<duration>,Artist - Title
+            extinf = line.partition(",")[2]
+        elif line and not line.startswith("#"):
+            if extinf:
+                yield _split_artist_title(extinf)
+            else:
+                entry = (path.parent / line) if not line.startswith(("http://", "https://")) else None
+                if entry is not None and entry.is_file():
+                    yield read_audio_tags(entry)
+                else:
+                    yield _split_artist_title(Path(line).stem)
+            extinf = None
+
+
+def _read_xspf(path: Path) -> Iterator[tuple[str, str]]:
+    from urllib.parse import unquote, urlparse
+    from xml.etree import ElementTree
+
+    ns = {"x": "http://xspf.org/ns/0/"}
+    for track in ElementTree.parse(path).getroot().iterfind(".//x:track", ns):
+        title = track.findtext("x:title", "", ns).strip()
+        artist = track.findtext("x:creator", "", ns).strip()
+        if title:
+            yield artist, title
+            continue
+        location = track.findtext("x:location", "", ns).strip()
+        if location:
+            yield _split_artist_title(Path(unquote(urlparse(location).path)).stem)
+
+
+def read_warm_source(path: Path) -> Iterator[tuple[str, str]]:
+    """
+    Yield (artist, title) pairs from a directory of audio files, an M3U/XSPF
+    playlist, or a text file of "artist<TAB>title" lines.
+    """
+    if path.is_dir():
+        for entry in sorted(path.rglob("*")):
+            if entry.suffix.lower() in AUDIO_EXTENSIONS and entry.is_file():
+                yield read_audio_tags(entry)
+    elif path.suffix.lower() in (".m3u", ".m3u8"):
+        yield from _read_m3u(path)
+    elif path.suffix.lower() == ".xspf":
+        yield from _read_xspf(path)
+    else:
+        for line in path.read_text(errors="replace").splitlines():
+            if not line.strip() or line.startswith("#"):
+                continue
+            artist, sep, title = line.partition("\t")
+            yield (artist.strip(), title.strip()) if sep else ("", artist.strip())
+
+
+class RateLimiter:
+    """Spaces out calls to at most `rate` per second across threads (0 = unlimited)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        time.sleep(start - now)
+
+
+def warm_cache(
+    tracks: Iterable[tuple[str, str]],
+    player: str = "",
+    workers: int = 4,
+    rate: float = 2.0,
+) -> Counter:
+    """
+    Fill the lyrics cache for (artist, title) pairs.
+    Keys already cached are skipped, so an interrupted run can simply be restarted.
+    Fetches no provider answered count as errors (get_lyrics() raises TimeoutError).
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    store = get_cache_store()
+    limiter = RateLimiter(rate)
+    stats: Counter = Counter()
+    seen: set[str] = set()
+    start = time.monotonic()
+
+    def fetch(artist: str, title: str, cache_key: str) -> str:
+        limiter.wait()
+        lyrics_content, _ = get_lyrics(artist, title, cache_key)
+        return lyrics_content
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lyrics-warm")
+    try:
+        futures = {}
+        for raw_artist, raw_title in tracks:
+            stats["tracks"] += 1
+            # Same clean_title() + md5 path as the daemon, so keys match
+            title, artist, cache_key = resolve_track(raw_title, raw_artist, player)
+            if not title:
+                stats["no_title"] += 1
+                continue
+            if cache_key in seen:
+                stats["duplicates"] += 1
+                continue
+            seen.add(cache_key)
+            if store.lookup(cache_key, title, artist) is not None:
+                stats["cached"] += 1
+                continue
+            futures[executor.submit(fetch, artist, title, cache_key)] = f"{artist} - {title}"
+
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                lyrics_content = future.result()
+            except Exception as e:
+                stats["errors"] += 1
+                print(f"[ERROR] {futures[future]}: {e}", file=sys.stderr)
+                continue
+            stats["fetched"] += 1
+            if not lyrics_content:
+                stats["not_found"] += 1
+            elif is_synced_lyrics(lyrics_content):
+                stats["synced"] += 1
+            else:
+                stats["plain"] += 1
+            print(f"[INFO] [{done}/{len(futures)}] {futures[future]}", file=sys.stderr)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    stats["elapsed_ms"] = int((time.monotonic() - start) * 1000)
+    return stats
+
+
+def format_warm_stats(stats: Counter) -> str:
+    """Human-readable summary of a warm_cache() run."""
+    elapsed = stats["elapsed_ms"] / 1000.0
+    unique = stats["tracks"] - stats["duplicates"] - stats["no_title"]
+    found = stats["synced"] + stats["plain"]
+    throughput = stats["fetched"] / elapsed if elapsed else 0.0
+    return "\n".join(
+        [
+            f"Tracks:     {stats['tracks']} ({unique} unique, {stats['no_title']} without title)",
+            f"Cached:     {stats['cached']} already cached"
+            f" ({stats['cached'] / unique:.0%} hit rate)" if unique else "Cached:     0",
+            f"Fetched:    {stats['fetched']} ({found} found: {stats['synced']} synced,"
+            f" {stats['plain']} plain; {stats['not_found']} not found; {stats['errors']} errors)",
+            f"Elapsed:    {elapsed:.1f}s ({throughput:.2f} fetches/s)",
+        ]
+    )
+
+
+def warm_main(args: argparse.Namespace) -> int:
+    """Entry point for `lyrics warm`."""
+    if not args.source.exists():
+        print(f"[ERROR] No such file or directory: {args.source}", file=sys.stderr)
+        return 1
+    try:
+        stats = warm_cache(read_warm_source(args.source), args.player, args.workers, args.rate)
+    except KeyboardInterrupt:
+        print("[INFO] Interrupted; rerun to resume (cached keys are skipped).", file=sys.stderr)
+        return 130
+    print(format_warm_stats(stats))
+    return 0
 
 
 def main():
@@ -850,98 +3819,155 @@ def main():
     parser.add_argument("--target", help="Target player name")
     parser.add_argument(
         "--format",
-        choices=["json", "waybar", "text", "raw"],
+        choices=OUTPUT_FORMATS,
         default="json",
         help="Output format",
     )
     parser.add_argument(
         "--daemon",
         action="store_true",
-        help="Run as daemon with 20Hz updates",
+        help="Run as event-driven daemon writing to /tmp/lyrics-daemon.json",
+    )
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Stream one JSON line per lyric change to stdout (json/waybar formats)",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Do not ask a running daemon; always query the player directly",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print the running daemon's metrics (latency histograms, counters) as JSON",
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=list(LOG_LEVELS),
+        help="stderr log level (default: $LYRICS_LOG_LEVEL or info)",
+    )
+    parser.add_argument(
+        "--cache-path",
+        type=Path,
+        help="Lyrics cache database (default: $LYRICS_CACHE_PATH or /tmp/lyrics_cache/lyrics.db)",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    warm_parser = subparsers.add_parser(
+        "warm", help="Pre-fill the lyrics cache from a track list, playlist or music directory"
+    )
+    warm_parser.add_argument(
+        "source",
+        type=Path,
+        help='"artist<TAB>title" text file, M3U/XSPF playlist, or directory of audio files',
+    )
+    warm_parser.add_argument(
+        "--player",
+        default="",
+        help="Player name used for title cleaning, so keys match that player (e.g. spotify)",
+    )
+    warm_parser.add_argument("--workers", type=int, default=4, help="Concurrent lookups")
+    warm_parser.add_argument(
+        "--rate", type=float, default=2.0, help="Max searches per second (0 = unlimited)"
     )
     args = parser.parse_args()
 
+    if args.cache_path:
+        global CACHE_DB_PATH
+        CACHE_DB_PATH = args.cache_path
+    if args.log_level:
+        LOG.set_level(args.log_level)
+
+    if args.stats:
+        reply = query_daemon("stats")
+        if reply is None:
+            print(f"Error: no daemon listening on {DAEMON_SOCKET_PATH}", file=sys.stderr)
+            sys.exit(1)
+        print(reply)
+        sys.exit(0)
+
+    if args.command == "warm":
+        sys.exit(warm_main(args))
+
     # Daemon mode
     if args.daemon:
         daemon = LyricsDaemon()
         daemon.run()
         return
 
+    if args.follow:
+        if args.format not in STREAM_FORMATS:
+            parser.error("--follow supports --format json or waybar")
+        # Reuse a running daemon's stream; otherwise (or once it stops) track players ourselves
+        if not args.no_daemon and not args.target:
+            try:
+                followed = follow_daemon(args.format)
+            except BrokenPipeError:
+                # Reader is gone; silence the final flush at exit
+                os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+                sys.exit(0)
+            if followed:
+                LOG.info("Daemon stream ended; tracking players directly")
+            else:
+                LOG.debug("No daemon on %s; tracking players directly", DAEMON_SOCKET_PATH)
+        daemon = LyricsDaemon(
+            output_file=None,
+            player_order=[args.target] if args.target else None,
+            serve=False,
+            metrics_file=None,
+        )
+        daemon.add_subscriber(StdoutSubscriber(args.format, daemon.remove_subscriber))
+        daemon.run()
+        return
+
+    # A running daemon already holds player state and parsed lyrics in memory
+    if not args.no_daemon:
+        request = f"query {args.format} {args.target or ''}".rstrip()
+        reply = query_daemon(request)
+        if reply is not None:
+            print(reply)
+            sys.exit(0)
+
     # Find active player
-    player, status = find_active_player(args.target)
+    player, state = find_player_state(args.target)
 
-    if not player or status not in ("Playing", "Paused"):
-        if args.format == "json":
-            print(json.dumps({"status": "stopped", "lines": []}))
-        elif args.format == "waybar":
-            print(
-                json.dumps(
-                    {"text": "", "class": "hidden", "tooltip": "No active player"}
-                )
-            )
-        else:
-            print("No active player found.")
+    if not player or state is None:
+        print(render_status(args.format, "stopped"))
         sys.exit(0)
 
     # Get metadata
-    artist = run_playerctl(player, "metadata", "xesam:artist") or ""
-    title = run_playerctl(player, "metadata", "xesam:title") or ""
-    trackid = run_playerctl(player, "metadata", "mpris:trackid") or ""
-    position_str = run_playerctl(player, "position") or "0"
-    position = float(position_str)
+    artist = state["artist"]
+    title = state["title"]
+    position = state["position"]
 
-    # Clean title (for all players including Spotify)
-    cleaned_title, extracted_artist = clean_title(title, artist, player)
-    title = cleaned_title
-    if extracted_artist:
-        artist = extracted_artist
+    # Clean title (for all players including Spotify) and generate cache key
+    title, artist, cache_key = resolve_track(title, artist, player)
 
     if not title:
-        if args.format == "json":
-            print(json.dumps({"status": "no_info", "lines": []}))
-        elif args.format == "waybar":
-            print(
-                json.dumps({"text": "", "class": "hidden", "tooltip": "No track info"})
-            )
-        else:
-            print("No track info available.")
+        print(render_status(args.format, "no_info"))
         sys.exit(0)
 
-    # Generate cache key using artist and title for consistency
-    cache_key = hashlib.md5(f"{artist}{title}".encode()).hexdigest()
-
-    # Get lyrics with metadata verification
-    lyrics_content, verified_cache_key = get_lyrics(artist, title, cache_key)
+    # Get lyrics with metadata verification (the playerctl fallback reports no length)
+    duration = state.get("length_us", 0) / 1_000_000.0 or None
+    try:
+        lyrics_content, verified_cache_key = get_lyrics(artist, title, cache_key, duration)
+    except TimeoutError as e:
+        LOG.info("Lyrics fetch failed: %s", e)
+        lyrics_content = ""
 
     if not lyrics_content:
-        if args.format == "json":
-            print(json.dumps({"status": "no_lyrics", "lines": []}))
-        elif args.format == "waybar":
-            print(
-                json.dumps(
-                    {"text": "", "class": "hidden", "tooltip": "No lyrics found"}
-                )
-            )
-        else:
-            print(f"Lyrics not found for: {artist} - {title}")
+        print(render_status(args.format, "no_lyrics", title, artist))
         sys.exit(0)
 
-    # Output raw LRC if requested
-    if args.format == "raw":
-        print(lyrics_content)
-        sys.exit(0)
+    # Parse lyrics (raw output skips it)
+    timeline = LyricsTimeline() if args.format == "raw" else LyricsTimeline.parse(lyrics_content)
 
-    # Parse lyrics
-    lyrics_lines = lyrics_content.strip().split("\n")
-    is_synced = is_synced_lyrics(lyrics_content)
-
-    # Generate output based on format
-    if args.format == "json":
-        print(output_json(lyrics_lines, position, is_synced))
-    elif args.format == "waybar":
-        print(output_waybar(lyrics_lines, position, is_synced))
-    elif args.format == "text":
-        print(output_text(lyrics_lines, position, is_synced, title, artist, player))
+    print(
+        render_lyrics(
+            args.format, lyrics_content, timeline, position, title, artist, player, progress=True
+        )
+    )
 
 
 if __name__ == "__main__":